@@ -10,6 +10,7 @@ Endpoints:
 
 Middleware:
     - CORS (configurable origins)
+    - GZip (large bodies, e.g. /metrics scrapes)
     - Request ID injection
     - Structured logging
     - Error handling
@@ -19,20 +20,48 @@ from __future__ import annotations
 
 import os
 import time
+import asyncio
 import logging
+import secrets
 from contextlib import asynccontextmanager
 from typing import Optional
 
+# ---- BLAS threading ------------------------------------------------------
+# Must run before numpy / torch are imported.  Each uvicorn worker gets an
+# equal share of the cores so BLAS pools don't oversubscribe the host.
+# Malformed values fall back to the defaults; per-library variables already
+# set by the operator always win.
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    try:
+        value = int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+_BLAS_THREADS = str(_env_positive_int(
+    "BLAS_NUM_THREADS",
+    max(1, (os.cpu_count() or 1) // _env_positive_int("WEB_CONCURRENCY", 2)),
+))
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, _BLAS_THREADS)
+
 from fastapi import FastAPI, Request, HTTPException, status
-from fastapi.responses import PlainTextResponse, JSONResponse
+from fastapi.responses import Response, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 import chromadb
 
 # Local imports
-from api.models import QueryRequest, QueryResponse, HealthResponse, RetrievedChunk
+from api.models import QueryRequest, QueryResponse, HealthResponse
+from api.query_cache import QueryCache
+from evaluation.faithfulness import FaithfulnessScorer
 from generation.rag_pipeline import RAGPipeline
 from retrieval.vector_store import VectorStoreManager
+from security.access_control import AccessController, ClearanceLevel, User
 from security.input_sanitizer import InputSanitizer
 from security.prompt_guard import PromptGuard
 
@@ -55,6 +84,13 @@ CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "secure_documents")
 FAITHFULNESS_THRESHOLD = float(os.getenv("FAITHFULNESS_THRESHOLD", "0.70"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "2"))
+ENCODE_BATCH_WINDOW_MS = float(os.getenv("ENCODE_BATCH_WINDOW_MS", "0"))
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR") or None
+EMBEDDING_PRECISION = os.getenv("EMBEDDING_PRECISION", "float32")
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+QUERY_CACHE_SIMILARITY = float(os.getenv("QUERY_CACHE_SIMILARITY", "0.95"))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "3600"))
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
 AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", "/app/logs/audit.jsonl")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
@@ -67,29 +103,47 @@ REQUEST_COUNT = Counter(
     "Total number of RAG requests",
     ["endpoint", "status"],
 )
+# Buckets are sized to the /query latency profile (tens of ms → seconds);
+# every observe() walks the bucket list, so keep it short.
 REQUEST_LATENCY = Histogram(
     "rag_request_duration_seconds",
     "RAG request latency in seconds",
     ["endpoint"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0],
 )
 FAITHFULNESS_SCORE = Histogram(
     "rag_faithfulness_score",
     "Distribution of faithfulness scores",
-    buckets=[0.0, 0.3, 0.5, 0.7, 0.8, 0.9, 1.0],
+    buckets=[0.0, 0.5, 0.7, 0.9, 1.0],
 )
 ACTIVE_REQUESTS = Gauge(
     "rag_active_requests",
     "Number of active RAG requests",
 )
 
+# Pre-bound label children for the hot path (skips the per-call label lookup)
+QUERY_LATENCY = REQUEST_LATENCY.labels(endpoint="/query")
+
 # ---------------------------------------------------------------------------
 # Global state (initialized at startup)
 # ---------------------------------------------------------------------------
 
 vector_store: Optional[VectorStoreManager] = None
 rag_pipeline: Optional[RAGPipeline] = None
+faithfulness_scorer: Optional[FaithfulnessScorer] = None
 input_sanitizer: Optional[InputSanitizer] = None
 prompt_guard: Optional[PromptGuard] = None
+access_controller = AccessController()
+query_cache = QueryCache(
+    max_entries=QUERY_CACHE_SIZE,
+    similarity_threshold=QUERY_CACHE_SIMILARITY,
+    ttl_seconds=QUERY_CACHE_TTL,
+)
+
+# Last /health result; probes within HEALTH_CACHE_TTL reuse it instead of
+# round-tripping to ChromaDB.  The lock stops concurrent probes recomputing.
+_health_cache = {"ts": float("-inf"), "chromadb": False, "model": False}
+_health_lock = asyncio.Lock()
 
 # ---------------------------------------------------------------------------
 # Lifespan context manager (startup/shutdown)
@@ -99,7 +153,7 @@ prompt_guard: Optional[PromptGuard] = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize resources on startup, clean up on shutdown."""
-    global vector_store, rag_pipeline, input_sanitizer, prompt_guard
+    global vector_store, rag_pipeline, faithfulness_scorer, input_sanitizer, prompt_guard
 
     logger.info("=== Application startup ===")
 
@@ -114,6 +168,19 @@ async def lifespan(app: FastAPI):
         logger.error(f"✗ ChromaDB connection failed: {exc}")
         raise
 
+    # Chunks ingested before query-time access filtering lack the filter
+    # keys, and ChromaDB never matches missing keys, so they are invisible
+    try:
+        sample = vector_store.collection.get(limit=1, include=["metadatas"])
+        if sample["ids"] and "clearance_level_n" not in (sample["metadatas"][0] or {}):
+            logger.warning(
+                "Collection has chunks without access-control filter keys; they "
+                "will not be retrieved. Run `python -m src.ingestion.ingest_docs "
+                "--backfill-acl` or re-ingest with --reset."
+            )
+    except Exception as exc:
+        logger.warning(f"Could not check collection metadata: {exc}")
+
     # ---- 2. Initialize security layer ----------------------------------
     input_sanitizer = InputSanitizer()
     prompt_guard = PromptGuard()
@@ -137,20 +204,34 @@ async def lifespan(app: FastAPI):
         # return response.choices[0].message.content
         return "Placeholder LLM response. Integrate OpenAI/Anthropic client here."
 
+    # Concurrent /query handlers share one scorer whose encodes are
+    # coalesced into a single forward pass.
+    faithfulness_scorer = FaithfulnessScorer(
+        batch_window_ms=ENCODE_BATCH_WINDOW_MS,
+        onnx_model_dir=ONNX_MODEL_DIR,
+        embedding_precision=EMBEDDING_PRECISION,
+    )
+
     rag_pipeline = RAGPipeline(
         llm_fn=_llm_wrapper,
         vector_store=vector_store.collection,
         faithfulness_threshold=FAITHFULNESS_THRESHOLD,
         max_retries=MAX_RETRIES,
         audit_log_path=AUDIT_LOG_PATH,
+        faithfulness_scorer=faithfulness_scorer,
+        reuse_store_embeddings=True,
     )
     logger.info("✓ RAG pipeline ready")
 
+    _health_cache["ts"] = float("-inf")  # first probe checks the fresh state
+
     logger.info("=== Application ready ===")
 
     yield  # application runs
 
     logger.info("=== Application shutdown ===")
+    rag_pipeline.close()  # release the audit log file
+    faithfulness_scorer.close()  # stop the encode batcher thread
 
 
 # ---------------------------------------------------------------------------
@@ -162,6 +243,7 @@ app = FastAPI(
     description="Production RAG system with hallucination mitigation and security controls",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # ---- CORS middleware ---------------------------------------------------
@@ -173,6 +255,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---- GZip middleware ---------------------------------------------------
+# Prometheus text exposition compresses ~10×; small JSON bodies are skipped.
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 
 # ---------------------------------------------------------------------------
 # Middleware: request ID + logging
@@ -182,8 +268,7 @@ app.add_middleware(
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
     """Inject request ID into every request for tracing."""
-    import uuid
-    request_id = str(uuid.uuid4())
+    request_id = secrets.token_hex(16)
     request.state.request_id = request_id
     response = await call_next(request)
     response.headers["X-Request-ID"] = request_id
@@ -206,6 +291,45 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# ---------------------------------------------------------------------------
+# Access control
+# ---------------------------------------------------------------------------
+
+
+def _resolve_user(body: QueryRequest) -> User:
+    """
+    Build the access-control identity of a /query caller.
+
+    The caller carries no roles or departments, so role- and
+    department-restricted chunks are never retrieved.  An unknown
+    clearance level is rejected rather than widened or narrowed.
+    """
+    level = (body.clearance_level or "public").upper()
+    try:
+        clearance = ClearanceLevel[level]
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown clearance level: {body.clearance_level}",
+        )
+    user_id = body.user_id or "anonymous"
+    return User(
+        user_id=user_id,
+        username=user_id,
+        clearance_level=clearance,
+        roles=[],
+        departments=[],
+    )
+
+
+def _cache_scope(user: User, body: QueryRequest) -> str:
+    """
+    Answer-cache scope covering everything that shapes the answer: the
+    resolved access scope, the caller and the retrieval depth.
+    """
+    return f"{user.clearance_level.name}|{user.user_id}|{body.top_k}"
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -219,21 +343,22 @@ async def health_check():
       - ECS target group health probes
       - Kubernetes liveness/readiness probes
     """
-    chromadb_ok = False
-    model_ok = False
-
-    try:
-        if vector_store and vector_store.collection:
-            vector_store.collection.count()  # simple operation to verify connection
-            chromadb_ok = True
-    except Exception as exc:
-        logger.warning(f"ChromaDB health check failed: {exc}")
-
-    try:
-        if rag_pipeline and rag_pipeline._faithfulness:
-            model_ok = True
-    except Exception as exc:
-        logger.warning(f"Model health check failed: {exc}")
+    async with _health_lock:
+        if time.monotonic() - _health_cache["ts"] >= HEALTH_CACHE_TTL:
+            chromadb_ok = False
+            try:
+                if vector_store and vector_store.collection:
+                    await asyncio.to_thread(vector_store.collection.count)  # verify connection off the event loop
+                    chromadb_ok = True
+            except Exception as exc:
+                logger.warning(f"ChromaDB health check failed: {exc}")
+
+            _health_cache["chromadb"] = chromadb_ok
+            _health_cache["model"] = bool(rag_pipeline and rag_pipeline.is_ready)
+            _health_cache["ts"] = time.monotonic()
+
+        chromadb_ok = _health_cache["chromadb"]
+        model_ok = _health_cache["model"]
 
     if not (chromadb_ok and model_ok):
         raise HTTPException(
@@ -255,7 +380,7 @@ async def metrics():
     Prometheus-compatible metrics endpoint.
     Scrape this with Prometheus or CloudWatch Container Insights.
     """
-    return PlainTextResponse(
+    return Response(
         content=generate_latest(),
         media_type=CONTENT_TYPE_LATEST,
     )
@@ -267,57 +392,99 @@ async def query_endpoint(request: Request, body: QueryRequest):
     Main RAG endpoint.  Processes a user query through the full pipeline:
         1. Input sanitization
         2. Prompt injection detection
-        3. Retrieval
-        4. Generation with faithfulness check
-        5. Audit logging
+        3. Answer cache lookup (exact, then semantic)
+        4. Retrieval, restricted to chunks the caller may access
+        5. Generation with faithfulness check
+        6. Audit logging
 
     Returns a structured response with answer + faithfulness score + metadata.
+
+    Every step below is synchronous (regex scans, model inference, ChromaDB
+    I/O), so each runs in the default thread pool to keep the event loop
+    free to accept concurrent requests.
     """
     ACTIVE_REQUESTS.inc()
     start = time.perf_counter()
 
     try:
+        user  = _resolve_user(body)
+        where = access_controller.get_filter_metadata(user)
+
         # ---- 1. Security: sanitize input -------------------------------
-        sanitization_result = input_sanitizer.sanitize(body.query)
+        sanitization_result = await asyncio.to_thread(input_sanitizer.sanitize, body.query)
         sanitized_query = sanitization_result.sanitized_text
 
         # ---- 2. Security: prompt injection guard -----------------------
-        if not prompt_guard.is_safe_query(sanitized_query):
+        if not await asyncio.to_thread(prompt_guard.is_safe_query, sanitized_query):
             REQUEST_COUNT.labels(endpoint="/query", status="blocked").inc()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Prompt injection detected",
             )
 
-        # ---- 3. Run RAG pipeline ---------------------------------------
-        result = rag_pipeline.run(sanitized_query)
-
-        # ---- 4. Convert to API response schema -------------------------
-        response = QueryResponse(
-            request_id=result.request_id,
-            query=result.query,
-            answer=result.answer,
-            faithfulness_score=result.faithfulness_score,
-            passed_faithfulness=result.passed_faithfulness,
-            chunks_used=[
-                RetrievedChunk(
-                    chunk_id=c.chunk_id,
-                    text=c.text,
-                    score=c.score,
-                    metadata=c.metadata,
-                )
+        # ---- 3. Answer cache ------------------------------------------
+        scope = _cache_scope(user, body)
+        query_emb = None
+        tier = "exact"
+        cached = query_cache.get_exact(scope, sanitized_query)
+        if cached is None and query_cache.semantic and faithfulness_scorer is not None:
+            query_emb = (await asyncio.to_thread(faithfulness_scorer.embed, [sanitized_query]))[0]
+            tier = "semantic"
+            cached = query_cache.get_similar(scope, query_emb)
+
+        if cached is not None:
+            REQUEST_COUNT.labels(endpoint="/query", status="cache_hit").inc()
+            latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            # cached answers skip run(), so audit the hit here
+            await asyncio.to_thread(
+                rag_pipeline.audit_cache_hit,
+                request.state.request_id, sanitized_query, tier, cached, latency_ms,
+            )
+            return ORJSONResponse({
+                **cached,
+                "request_id": request.state.request_id,
+                "query": sanitized_query,
+                "latency_ms": latency_ms,
+                "metadata": {**cached["metadata"], "cached": True, "cache_tier": tier},
+            })
+
+        # ---- 4. Run RAG pipeline ---------------------------------------
+        result = await asyncio.to_thread(rag_pipeline.run, sanitized_query, where)
+
+        # ---- 5. Serialise ----------------------------------------------
+        # Built as a plain dict and handed straight to orjson: the pipeline
+        # already produces well-typed values, so a QueryResponse round trip
+        # (validate → dump → json) would only repeat work.  The schema is
+        # still published via response_model.
+        payload = {
+            "request_id": result.request_id,
+            "query": result.query,
+            "answer": result.answer,
+            "faithfulness_score": result.faithfulness_score,
+            "passed_faithfulness": result.passed_faithfulness,
+            "chunks_used": [
+                {
+                    "chunk_id": c.chunk_id,
+                    "text": c.text,
+                    "score": c.score,
+                    "metadata": c.metadata,
+                }
                 for c in result.chunks_used
             ],
-            retries_used=result.retries_used,
-            latency_ms=result.latency_ms,
-            metadata=result.metadata,
-        )
+            "retries_used": result.retries_used,
+            "latency_ms": result.latency_ms,
+            "metadata": result.metadata,
+        }
 
-        # ---- 5. Metrics ------------------------------------------------
+        # ---- 6. Metrics ------------------------------------------------
         REQUEST_COUNT.labels(endpoint="/query", status="success").inc()
         FAITHFULNESS_SCORE.observe(result.faithfulness_score)
 
-        return response
+        # Only grounded answers are cached; fallbacks should be retried.
+        if result.passed_faithfulness:
+            query_cache.put(scope, sanitized_query, query_emb, payload)
+
+        return ORJSONResponse(payload)
 
     except HTTPException:
         raise
@@ -331,7 +498,7 @@ async def query_endpoint(request: Request, body: QueryRequest):
     finally:
         ACTIVE_REQUESTS.dec()
         latency = time.perf_counter() - start
-        REQUEST_LATENCY.labels(endpoint="/query").observe(latency)
+        QUERY_LATENCY.observe(latency)
 
 
 @app.get("/", tags=["Root"])
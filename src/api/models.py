@@ -7,7 +7,11 @@ Pydantic schemas for request/response validation and OpenAPI documentation.
 from __future__ import annotations
 
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+# Schemas are immutable and reject unknown fields.
+_STRICT = ConfigDict(extra="forbid", frozen=True)
 
 
 # ---------------------------------------------------------------------------
@@ -17,6 +21,8 @@ from pydantic import BaseModel, Field, field_validator
 
 class QueryRequest(BaseModel):
     """POST /query request body."""
+    model_config = _STRICT
+
     query: str = Field(
         ...,
         min_length=1,
@@ -38,7 +44,7 @@ class QueryRequest(BaseModel):
     clearance_level: Optional[str] = Field(
         default="public",
         description="RBAC clearance level",
-        examples=["public", "internal", "confidential", "restricted"],
+        examples=["public", "internal", "confidential", "secret", "top_secret"],
     )
 
     @field_validator("query")
@@ -55,14 +61,18 @@ class QueryRequest(BaseModel):
 
 class RetrievedChunk(BaseModel):
     """A single retrieved chunk with metadata."""
+    model_config = _STRICT
+
     chunk_id: str
     text: str
-    score: float = Field(ge=0.0, le=1.0)
+    score: float                # 1 / (1 + L2 distance), already in (0, 1]
     metadata: dict = Field(default_factory=dict)
 
 
 class QueryResponse(BaseModel):
     """POST /query response body."""
+    model_config = _STRICT
+
     request_id: str
     query: str
     answer: str
@@ -76,6 +86,8 @@ class QueryResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """GET /health response."""
+    model_config = _STRICT
+
     status: str = Field(examples=["healthy"])
     version: str = Field(examples=["1.0.0"])
     chromadb_connected: bool
@@ -84,6 +96,8 @@ class HealthResponse(BaseModel):
 
 class MetricsResponse(BaseModel):
     """GET /metrics response (Prometheus-compatible plain text returned separately)."""
+    model_config = _STRICT
+
     total_requests: int = Field(ge=0)
     total_errors: int = Field(ge=0)
     avg_latency_ms: float = Field(ge=0.0)
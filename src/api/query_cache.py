@@ -0,0 +1,177 @@
+"""
+query_cache.py
+==============
+Two-tier answer cache for ``POST /query``.
+
+    1. Exact tier     – keyed on the sanitised query string.
+    2. Semantic tier  – cosine similarity between the incoming query
+                        embedding and every cached query embedding; a hit
+                        above ``similarity_threshold`` (default 0.95) reuses
+                        the cached answer for a re-phrased question.
+
+Entries are namespaced by a *scope* string that the caller builds from
+every request parameter that affects the answer (``POST /query`` uses the
+resolved clearance level, user id and ``top_k``), so an answer produced
+for one scope is never served to another.  The scope is only as
+trustworthy as those parameters: an unauthenticated clearance level
+isolates callers by what they claim, not by who they are.  The cache
+is bounded (oldest entry evicted first) and entries expire after
+``ttl_seconds`` so newly ingested documents are eventually reflected.
+
+Query embeddings live as rows of one preallocated matrix that grows by
+doubling; inserts write a row and evictions free one, so a lookup never
+has to restack every cached embedding.
+
+The cache is only touched from the event loop, so it carries no lock.
+"""
+
+from __future__ import annotations
+
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    embedding: Optional[np.ndarray]
+    value:     Any
+    expires:   float
+
+
+class QueryCache:
+    """
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of cached answers (0 disables the cache).
+    similarity_threshold : float | None
+        Minimum cosine similarity for a semantic hit.  ``None`` disables
+        the semantic tier.
+    ttl_seconds : float
+        Lifetime of a cached answer.
+    """
+
+    def __init__(
+        self,
+        max_entries:          int             = 1024,
+        similarity_threshold: Optional[float] = 0.95,
+        ttl_seconds:          float           = 3600.0,
+    ):
+        self.max_entries          = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds          = ttl_seconds
+
+        self._entries : OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._matrix  : Optional[np.ndarray]          = None  # embedding rows
+        self._keys    : list[Optional[tuple[str, str]]] = []  # key per row, None = free
+        self._rows    : dict[tuple[str, str], int]    = {}    # key → row
+        self._free    : list[int]                     = []    # reusable rows
+
+        self.exact_hits    = 0
+        self.semantic_hits = 0
+        self.misses        = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def semantic(self) -> bool:
+        return self.enabled and self.similarity_threshold is not None
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_exact(self, scope: str, query: str) -> Optional[Any]:
+        """Return the cached answer for this exact query, if still fresh."""
+        entry = self._entries.get((scope, query))
+        if entry is None:
+            return None
+        if entry.expires < time.monotonic():
+            self._drop((scope, query))
+            return None
+        self.exact_hits += 1
+        return entry.value
+
+    def get_similar(self, scope: str, embedding: np.ndarray) -> Optional[Any]:
+        """Return the answer of the closest cached query above the threshold."""
+        if not self.semantic or not self._rows:
+            self.misses += 1
+            return None
+
+        sims = self._matrix[:len(self._keys)] @ embedding
+        for idx in np.argsort(sims)[::-1]:
+            if sims[idx] < self.similarity_threshold:
+                break
+            key = self._keys[idx]
+            if key is None or key[0] != scope:
+                continue
+            entry = self._entries[key]
+            if entry.expires < time.monotonic():
+                continue
+            self.semantic_hits += 1
+            return entry.value
+
+        self.misses += 1
+        return None
+
+    # ------------------------------------------------------------------
+    # Insert / evict
+    # ------------------------------------------------------------------
+
+    def put(
+        self, scope: str, query: str, embedding: Optional[np.ndarray], value: Any
+    ) -> None:
+        """Store *value*, evicting the oldest entries beyond ``max_entries``."""
+        if not self.enabled:
+            return
+        key = (scope, query)
+        self._drop(key)
+        self._entries[key] = _Entry(
+            embedding = embedding,
+            value     = value,
+            expires   = time.monotonic() + self.ttl_seconds,
+        )
+        if embedding is not None:
+            self._add_row(key, embedding)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._matrix = None
+        self._keys   = []
+        self._rows   = {}
+        self._free   = []
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        self._entries.pop(key, None)
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._keys[row]   = None
+            self._matrix[row] = 0.0
+            self._free.append(row)
+
+    def _add_row(self, key: tuple[str, str], embedding: np.ndarray) -> None:
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._keys)
+            self._keys.append(None)
+            if self._matrix is None:
+                self._matrix = np.zeros((16, embedding.shape[0]), dtype=np.float32)
+            elif row == len(self._matrix):
+                grown = np.zeros((2 * row, self._matrix.shape[1]), dtype=np.float32)
+                grown[:row] = self._matrix
+                self._matrix = grown
+        self._matrix[row] = embedding
+        self._keys[row]   = key
+        self._rows[key]   = row
@@ -29,13 +29,32 @@ having thin evidence.
 
 The model is loaded once and cached for the lifetime of the scorer
 instance — safe to keep as a module-level singleton in long-running
-services (FastAPI workers, etc.).
+services (FastAPI workers, etc.).  Embeddings are memoised in a bounded
+LRU keyed by a content hash, so chunks that come back from the vector
+store on repeat queries are not re-encoded.
+
+Optionally the encoder can run as an INT8-quantised ONNX graph via
+onnxruntime (2–4× faster on CPU).  Export once at build time:
+
+    optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 minilm/
+    optimum-cli onnxruntime quantize --avx512_vnni --onnx_model minilm/ -o minilm-int8/
+
+and pass ``onnx_model_dir="minilm-int8/"``.  If onnxruntime or the export
+is missing the scorer falls back to the PyTorch SentenceTransformer.
 """
 
 from __future__ import annotations
 
 import re
+import time
+import queue
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 import numpy as np
@@ -48,29 +67,80 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 DEFAULT_MODEL       = "all-MiniLM-L6-v2"
+EMBED_CACHE_SIZE    = 10_000    # max cached embeddings per scorer
+SCORE_CACHE_SIZE    = 1_024     # max cached (response, context) scores
+ENCODE_MAX_BATCH    = 64        # max texts per coalesced forward pass
+SHORT_RESPONSE_CHARS = 20       # "trivial answer" length cut-off
 CLAIM_SEM_THRESHOLD = 0.55      # per-claim semantic threshold
 CLAIM_LEX_THRESHOLD = 0.35      # per-claim lexical fallback threshold
 NUMBER_RE           = re.compile(r"\b\d+(?:,\d{3})*(?:\.\d+)?\b")
 SENTENCE_RE         = re.compile(r"(?<=[.!?])\s+")
-HEDGE_WORDS         = {
+WORD_RE             = re.compile(r"[a-z0-9]+")
+HEDGE_RE            = re.compile(r"[a-z]+")
+HEDGE_WORDS         = frozenset({
     "perhaps", "maybe", "possibly", "might", "could", "probably",
     "likely", "seems", "appears", "suggests", "uncertain", "unclear",
     "not sure", "unsure",
-}
+})
+# single-pass presence check on the lowered text, with the same token
+# boundaries as HEDGE_RE; most responses contain no hedge word at all
+HEDGE_PATTERN       = re.compile(
+    r"(?<![a-z])(?:"
+    + "|".join(sorted(w for w in HEDGE_WORDS if HEDGE_RE.fullmatch(w)))
+    + r")(?![a-z])"
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
-def _tokenise(text: str) -> set[str]:
-    """Lowercase word-token set."""
-    return set(re.findall(r"[a-z0-9]+", text.lower()))
+@lru_cache(maxsize=4096)
+def _token_hashes(text: str) -> np.ndarray:
+    """
+    Sorted, de-duplicated 64-bit hashes of the lowercase word tokens.
+
+    A compact stand-in for a ``set[str]``: membership tests against the
+    (large) context become a vectorised sorted-merge instead of per-token
+    Python set lookups.  Memoised: the same chunks are retrieved for many
+    queries and retries; the returned array is shared and read-only.
+    """
+    hashes = np.unique(np.fromiter(
+        (hash(t) for t in WORD_RE.findall(text.lower())), dtype=np.int64,
+    ))
+    hashes.flags.writeable = False
+    return hashes
+
+
+def _lexical_overlap(claim_hashes: np.ndarray, ctx_hashes: np.ndarray) -> float:
+    """Fraction of the claim's distinct tokens that occur in the context."""
+    if claim_hashes.size == 0:
+        return 0.0
+    shared = np.intersect1d(claim_hashes, ctx_hashes, assume_unique=True).size
+    return shared / claim_hashes.size
+
 
+def _context_hashes(chunks: list[str]) -> np.ndarray:
+    """Token hashes of the whole context, built chunk by chunk (no join)."""
+    return np.unique(np.concatenate([_token_hashes(c) for c in chunks]))
 
-def _extract_numbers(text: str) -> set[str]:
+
+def _extract_numbers(text: str) -> frozenset[str]:
     """Normalised numeric strings (commas removed)."""
-    return {m.replace(",", "") for m in NUMBER_RE.findall(text)}
+    return frozenset(m.replace(",", "") for m in NUMBER_RE.findall(text))
+
+
+def _text_key(text: str) -> bytes:
+    """Compact content hash used as the embedding-cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _array_key(arr: np.ndarray) -> bytes:
+    """Content hash of an embedding matrix (shape and dtype included)."""
+    arr = np.ascontiguousarray(arr)
+    h = hashlib.blake2b(f"{arr.dtype.str}{arr.shape}".encode(), digest_size=16)
+    h.update(arr.data)
+    return h.digest()
 
 
 def _split_claims(text: str) -> list[str]:
@@ -84,6 +154,182 @@ def _split_claims(text: str) -> list[str]:
     ]
 
 
+def _analyse_response(response: str) -> tuple[list[str], list[np.ndarray], frozenset[str]]:
+    """
+    Response-side text features, each derived exactly once per score.
+
+    Returns ``(claims, claim_tokens, numbers)``; ``claim_tokens[i]`` are the
+    token hashes of ``claims[i]``, shared by the coverage and per-claim
+    detail signals instead of being re-tokenised by each.
+    """
+    claims = _split_claims(response)
+    return claims, [_token_hashes(c) for c in claims], _extract_numbers(response)
+
+
+# ---------------------------------------------------------------------------
+# ONNX Runtime encoder  (optional)
+# ---------------------------------------------------------------------------
+
+
+class _OnnxEncoder:
+    """
+    Minimal drop-in for ``SentenceTransformer.encode`` backed by an
+    onnxruntime session: tokenise → run graph → mean-pool → L2-normalise.
+    """
+
+    MAX_SEQ_LENGTH = 256                                   # MiniLM default
+
+    def __init__(self, model_dir: str):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        path   = Path(model_dir)
+        graphs = sorted(path.glob("*quantized*.onnx")) or sorted(path.glob("*.onnx"))
+        if not graphs:
+            raise FileNotFoundError(f"No .onnx model found in {model_dir}")
+
+        self._tokenizer   = AutoTokenizer.from_pretrained(model_dir)
+        self._session     = ort.InferenceSession(
+            str(graphs[0]), providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+    def encode(
+        self,
+        texts:                list[str],
+        normalize_embeddings: bool = False,
+        batch_size:           int  = 32,
+        **_:                  object,
+    ) -> np.ndarray:
+        out = []
+        for i in range(0, len(texts), max(batch_size, 1)):
+            enc = self._tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.MAX_SEQ_LENGTH,
+                return_tensors="np",
+            )
+            feeds  = {k: v.astype(np.int64) for k, v in enc.items() if k in self._input_names}
+            hidden = self._session.run(None, feeds)[0]
+            mask   = enc["attention_mask"][..., None].astype(np.float32)
+            out.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        embs = np.ascontiguousarray(np.concatenate(out), dtype=np.float32)
+        if normalize_embeddings:
+            embs /= np.clip(np.linalg.norm(embs, axis=1, keepdims=True), 1e-12, None)
+        return embs
+
+
+def _load_model(model_name: str, onnx_model_dir: Optional[str]):
+    """ONNX encoder when requested and available, else SentenceTransformer."""
+    if onnx_model_dir:
+        try:
+            model = _OnnxEncoder(onnx_model_dir)
+            logger.info("FaithfulnessScorer: using ONNX model from '%s'.", onnx_model_dir)
+            return model
+        except Exception as exc:
+            logger.warning(
+                "FaithfulnessScorer: ONNX model unavailable (%s) – falling back to PyTorch.", exc,
+            )
+    return SentenceTransformer(model_name)
+
+
+# ---------------------------------------------------------------------------
+# Cross-request encode batching
+# ---------------------------------------------------------------------------
+
+
+class _BatcherClosed(RuntimeError):
+    """Raised by ``_EncodeBatcher.encode`` after ``close()``."""
+
+
+class _EncodeBatcher:
+    """
+    Coalesces concurrent ``encode`` calls into a single forward pass.
+
+    Callers (typically FastAPI worker threads) enqueue their texts and block
+    on a future; one background thread drains the queue — whatever is
+    already waiting, plus anything arriving within ``max_delay_ms`` — and
+    runs one ``model.encode`` over the union, then hands each caller its
+    slice.  With ``max_delay_ms=0`` nothing extra is waited for, so a lone
+    request pays no added latency.  ``close()`` stops the thread once the
+    work already queued is done.
+    """
+
+    def __init__(self, model, max_batch: int = ENCODE_MAX_BATCH, max_delay_ms: float = 0.0):
+        self._model    = model
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue    : queue.Queue[tuple[list[str], Future]] = queue.Queue()
+        self._closed   = False
+        self._lock     = threading.Lock()          # orders puts vs. the sentinel
+        self._thread   = threading.Thread(
+            target=self._run, name="faithfulness-encoder", daemon=True,
+        )
+        self._thread.start()
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Blocking encode; returns an L2-normalised float32 matrix."""
+        fut: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise _BatcherClosed("encode batcher is closed")
+            self._queue.put((texts, fut))
+        return fut.result()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Finish queued work, then stop and join the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)                  # sentinel
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending  = [item]
+            n_texts  = len(item[0])
+            deadline = time.monotonic() + self.max_delay
+
+            while n_texts < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                pending.append(item)
+                n_texts += len(item[0])
+
+            texts = [t for batch, _ in pending for t in batch]
+            try:
+                embs = np.asarray(
+                    self._model.encode(
+                        texts,
+                        normalize_embeddings=True,
+                        batch_size=min(len(texts), ENCODE_MAX_BATCH),
+                        convert_to_numpy=True,
+                    ),
+                    dtype=np.float32,
+                )
+            except Exception as exc:
+                for _, fut in pending:
+                    fut.set_exception(exc)
+                continue
+
+            offset = 0
+            for batch, fut in pending:
+                fut.set_result(embs[offset:offset + len(batch)])
+                offset += len(batch)
+
+
 # ---------------------------------------------------------------------------
 # Core class
 # ---------------------------------------------------------------------------
@@ -99,6 +345,29 @@ class FaithfulnessScorer:
         Must contain keys ``semantic``, ``coverage``, ``numeric`` and sum to 1.0.
     hedge_max_penalty : float
         Maximum penalty subtracted when hedging + weak evidence detected.
+    cache_size : int
+        Maximum number of embeddings kept in the LRU cache (0 disables it).
+    batch_window_ms : float | None
+        When set, encodes from concurrent callers are coalesced into one
+        forward pass, waiting up to this many ms for more work to arrive.
+        ``None`` (default) encodes inline on the calling thread.
+    onnx_model_dir : str | None
+        Directory with an exported (ideally INT8-quantised) ONNX model and
+        its tokenizer.  Used instead of PyTorch when onnxruntime is installed.
+    short_response_score : float | None
+        When set, responses shorter than 20 characters with no claims and
+        no numbers (e.g. "I don't know.", or punctuation such as "...")
+        get this score without running the model.  ``None`` (default)
+        scores them normally.
+    embedding_precision : str
+        ``"float32"`` (default) or ``"float16"``.  With ``"float16"`` every
+        embedding is rounded to half precision and cached that way, halving
+        cache memory; similarities are still computed in float32 BLAS.
+    score_cache_size : int
+        Maximum number of final scores kept per ``(response, context)``
+        pair, so re-scoring an identical answer skips claim splitting and
+        similarity work entirely (0 disables it).  When ``chunk_embs`` are
+        supplied, a hash of them is part of the key.
     """
 
     DEFAULT_WEIGHTS = {
@@ -112,9 +381,34 @@ class FaithfulnessScorer:
         model_name:        str                          = DEFAULT_MODEL,
         weights:           Optional[dict[str, float]]  = None,
         hedge_max_penalty: float                       = 0.10,
+        cache_size:        int                         = EMBED_CACHE_SIZE,
+        batch_window_ms:   Optional[float]             = None,
+        onnx_model_dir:    Optional[str]               = None,
+        short_response_score: Optional[float]          = None,
+        embedding_precision:  str                      = "float32",
+        score_cache_size:     int                      = SCORE_CACHE_SIZE,
     ):
         self.weights           = weights or self.DEFAULT_WEIGHTS
         self.hedge_max_penalty = hedge_max_penalty
+        self.cache_size        = cache_size
+        self.short_response_score = short_response_score
+        self.score_cache_size  = score_cache_size
+
+        if embedding_precision not in ("float32", "float16"):
+            raise ValueError(
+                f"embedding_precision must be 'float32' or 'float16', got {embedding_precision!r}"
+            )
+        self._store_dtype = np.dtype(embedding_precision)
+
+        # ---- embedding cache (content hash → normalised vector) ---------
+        self._emb_cache    : OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._cache_lock   = threading.Lock()
+        self._cache_hits   = 0
+        self._cache_misses = 0
+
+        # ---- score cache ((response, chunks[, embs]) hashes → score) ---
+        self._score_cache    : OrderedDict[tuple, float] = OrderedDict()
+        self._encode_failures = 0   # failed scores are never cached
 
         # ---- validate weights ------------------------------------------
         total = sum(self.weights.values())
@@ -123,14 +417,29 @@ class FaithfulnessScorer:
 
         # ---- load model ------------------------------------------------
         logger.info("FaithfulnessScorer: loading '%s' …", model_name)
-        self._model = SentenceTransformer(model_name)
+        self._model = _load_model(model_name, onnx_model_dir)
         logger.info("FaithfulnessScorer: model ready.")
 
+        self._batcher = (
+            _EncodeBatcher(self._model, max_delay_ms=batch_window_ms)
+            if batch_window_ms is not None else None
+        )
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def score(self, response: str, context_chunks: list[str]) -> float:
+    @property
+    def model_loaded(self) -> bool:
+        """True when the embedding model is loaded and can encode."""
+        return getattr(self, "_model", None) is not None
+
+    def score(
+        self,
+        response:       str,
+        context_chunks: list[str],
+        chunk_embs:     Optional[np.ndarray] = None,
+    ) -> float:
         """
         Return a single faithfulness score in [0.0, 1.0].
 
@@ -138,6 +447,10 @@ class FaithfulnessScorer:
         ----------
         response       : str   – the LLM-generated answer.
         context_chunks : list  – the chunks that were fed into the prompt.
+        chunk_embs     : array – optional (n_chunks, dim) embeddings already
+                                 stored for the chunks (e.g. by ChromaDB at
+                                 ingest time, same model).  Skips re-encoding
+                                 the chunks; only response + claims are encoded.
 
         Returns
         -------
@@ -149,39 +462,130 @@ class FaithfulnessScorer:
             logger.warning("score() called with empty input – returning 0.0")
             return 0.0
 
-        combined = "\n".join(context_chunks)
+        # stored embeddings may differ slightly from the model's own, so
+        # they are part of the key rather than a reason to skip the cache
+        key = None
+        if self.score_cache_size > 0:
+            key = (_text_key(response), *map(_text_key, context_chunks))
+            if chunk_embs is not None:
+                key += (_array_key(chunk_embs),)
+            with self._cache_lock:
+                cached = self._score_cache.get(key)
+                if cached is not None:
+                    self._score_cache.move_to_end(key)
+                    return cached
+
+        failures = self._encode_failures
+        sem, cov, num, penalty, final, _ = self._evaluate(
+            response, context_chunks, chunk_embs=chunk_embs,
+        )
+        logger.debug(
+            "faithfulness | sem=%.3f cov=%.3f num=%.3f penalty=%.3f → %.4f",
+            sem, cov, num, penalty, final,
+        )
+        final = round(final, 4)
 
-        # --- signal 1: semantic similarity ------------------------------
-        sem   = self._semantic_similarity(response, context_chunks)
+        if key is not None and self._encode_failures == failures:
+            with self._cache_lock:
+                self._score_cache[key] = final
+                while len(self._score_cache) > self.score_cache_size:
+                    self._score_cache.popitem(last=False)
+        return final
 
-        # --- signal 2: claim coverage ----------------------------------
-        cov   = self._claim_coverage(response, context_chunks, combined)
+    def score_batch(
+        self,
+        responses:           list[str],
+        context_chunks_list: list[list[str]],
+    ) -> list[float]:
+        """
+        Score many ``(response, context_chunks)`` pairs.
 
-        # --- signal 3: numeric consistency ------------------------------
-        num   = self._numeric_consistency(response, combined)
+        Equivalent to calling :meth:`score` on each pair, but every distinct
+        text (responses, claims, chunks) of a window of samples is encoded in
+        one large ``encode`` call first; per-sample scoring then reads its
+        embeddings back from the cache.  Windows are sized to half the cache
+        so warmed embeddings are not evicted before they are used.
 
-        # --- weighted sum ----------------------------------------------
-        raw   = (
-            self.weights["semantic"] * sem +
-            self.weights["coverage"] * cov +
-            self.weights["numeric"]  * num
-        )
+        Parameters
+        ----------
+        responses           : list[str]       – LLM answers.
+        context_chunks_list : list[list[str]] – chunks for each answer.
 
-        # --- hedge penalty ---------------------------------------------
-        penalty = self._hedge_penalty(response, sem)
+        Returns
+        -------
+        list[float]
+            One score per pair, in input order.
+        """
+        if len(responses) != len(context_chunks_list):
+            raise ValueError("responses and context_chunks_list differ in length")
+
+        pairs  = list(zip(responses, context_chunks_list))
+        budget = self.cache_size // 2
+        if budget <= 0:                                    # cache disabled
+            return [self.score(r, c) for r, c in pairs]
+
+        scores : list[float] = []
+        start = 0
+        while start < len(pairs):
+            texts : list[str] = []
+            end   = start
+            while end < len(pairs) and (end == start or len(texts) < budget):
+                response, chunks = pairs[end]
+                if response and chunks:
+                    texts.append(response)
+                    texts.extend(_split_claims(response))
+                    texts.extend(chunks)
+                end += 1
+
+            if texts:
+                self._encode(list(dict.fromkeys(texts)))   # warm the cache
+            scores.extend(self.score(r, c) for r, c in pairs[start:end])
+            start = end
+        return scores
+
+    def close(self) -> None:
+        """Stop the cross-request encode batcher, if any; later encodes run inline."""
+        batcher, self._batcher = self._batcher, None
+        if batcher is not None:
+            batcher.close()
+
+    def clear_caches(self) -> None:
+        """
+        Drop cached embeddings and scores and reset the hit/miss counters.
+        Also clears the process-wide token-hash memo shared by all scorers.
+        """
+        _token_hashes.cache_clear()
+        with self._cache_lock:
+            self._emb_cache.clear()
+            self._score_cache.clear()
+            self._cache_hits   = 0
+            self._cache_misses = 0
+
+    def precompute_chunks(self, context_chunks: list[str]) -> np.ndarray:
+        """
+        Embed *context_chunks* once for repeated scoring against the same
+        context (e.g. retries).  Pass the result as ``chunk_embs`` to
+        :meth:`score`; only the response and its claims are then encoded.
+        """
+        return self._encode(list(context_chunks))
 
-        final = max(0.0, min(1.0, raw - penalty))
-        logger.debug(
-            "faithfulness | sem=%.3f cov=%.3f num=%.3f penalty=%.3f → %.4f",
-            sem, cov, num, penalty, final,
-        )
-        return round(final, 4)
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """
+        L2-normalised float32 embeddings for *texts*, sharing the scorer's
+        model and embedding cache (e.g. for query-level answer caching).
+        """
+        return self._encode(texts)
 
     # ------------------------------------------------------------------
     # Detailed scoring  (useful for evaluation dashboards)
     # ------------------------------------------------------------------
 
-    def score_detailed(self, response: str, context_chunks: list[str]) -> dict:
+    def score_detailed(
+        self,
+        response:       str,
+        context_chunks: list[str],
+        chunk_embs:     Optional[np.ndarray] = None,
+    ) -> dict:
         """
         Same as score() but returns every sub-signal for logging / dashboards.
         """
@@ -189,11 +593,81 @@ class FaithfulnessScorer:
             return {"overall": 0.0, "semantic": 0.0, "coverage": 0.0,
                     "numeric": 0.0, "penalty": 0.0, "claims": []}
 
-        combined = "\n".join(context_chunks)
+        sem, cov, num, penalty, overall, claims = self._evaluate(
+            response, context_chunks, with_claims=True, chunk_embs=chunk_embs,
+        )
+
+        return {
+            "overall":  round(overall, 4),
+            "semantic": round(sem, 4),
+            "coverage": round(cov, 4),
+            "numeric":  round(num, 4),
+            "penalty":  round(penalty, 4),
+            "claims":   claims,
+        }
+
+    # ------------------------------------------------------------------
+    # Shared scoring core
+    # ------------------------------------------------------------------
 
-        sem     = self._semantic_similarity(response, context_chunks)
-        cov     = self._claim_coverage(response, context_chunks, combined)
-        num     = self._numeric_consistency(response, combined)
+    def _evaluate(
+        self,
+        response:    str,
+        chunks:      list[str],
+        with_claims: bool                 = False,
+        chunk_embs:  Optional[np.ndarray] = None,
+    ) -> tuple[float, float, float, float, float, list[dict]]:
+        """
+        Compute every signal from a single batched ``encode`` call.
+
+        Returns ``(semantic, coverage, numeric, penalty, overall, claims)``;
+        ``claims`` is only populated when *with_claims* is set.
+        """
+        claims, claim_tokens, resp_nums = _analyse_response(response)
+
+        # ---- trivial responses: nothing worth a forward pass ------------
+        if (
+            self.short_response_score is not None
+            and len(response) < SHORT_RESPONSE_CHARS
+            and not claims and not resp_nums
+        ):
+            return 0.0, 0.0, 0.0, 0.0, self.short_response_score, []
+
+        # the context token set only feeds the lexical fallback; coverage
+        # builds it on demand, so it is skipped when every claim is
+        # semantically supported.  Per-claim detail always needs it.
+        ctx_tokens = _context_hashes(chunks) if with_claims and claims else None
+
+        try:
+            resp_emb, claim_embs, chunk_embs = self._encode_all(
+                response, claims, chunks, chunk_embs,
+            )
+        except Exception as exc:                           # pragma: no cover
+            logger.error("Encoding failed: %s", exc)
+            self._encode_failures += 1
+            sem    = 0.0
+            cov    = 0.0 if claims else 1.0
+            detail = [{"claim": c, "supported": False, "error": str(exc)} for c in claims]
+        else:
+            sem    = self._semantic_similarity_emb(resp_emb, chunk_embs)
+            cov    = self._claim_coverage_emb(
+                claims, claim_tokens, claim_embs, chunk_embs, chunks, ctx_tokens,
+            )
+            detail = (
+                self._score_claims_emb(
+                    claims, claim_tokens, claim_embs, chunk_embs, chunks, ctx_tokens,
+                )
+                if with_claims else []
+            )
+
+        # the context scan is the largest regex pass; skip it when the
+        # response has no numbers to check
+        ctx_nums  = (
+            frozenset().union(*map(_extract_numbers, chunks))
+            if resp_nums else frozenset()
+        )
+
+        num     = self._numeric_consistency(resp_nums, ctx_nums)
         penalty = self._hedge_penalty(response, sem)
 
         raw     = (
@@ -201,19 +675,96 @@ class FaithfulnessScorer:
             self.weights["coverage"] * cov +
             self.weights["numeric"]  * num
         )
-        overall = round(max(0.0, min(1.0, raw - penalty)), 4)
+        overall = max(0.0, min(1.0, raw - penalty))
+        return sem, cov, num, penalty, overall, detail
 
-        # per-claim detail
-        claims = self._score_claims(response, context_chunks, combined)
+    def _encode_all(
+        self,
+        response:   str,
+        claims:     list[str],
+        chunks:     list[str],
+        chunk_embs: Optional[np.ndarray] = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Embed response, claims and chunks in one forward pass.
 
-        return {
-            "overall":  overall,
-            "semantic": round(sem, 4),
-            "coverage": round(cov, 4),
-            "numeric":  round(num, 4),
-            "penalty":  round(penalty, 4),
-            "claims":   claims,
-        }
+        Returns ``(response_emb, claim_embs, chunk_embs)`` sliced from the
+        single batch, all L2-normalised.  Precomputed *chunk_embs* are
+        normalised and reused when their shape matches the chunks.
+        """
+        n_claims = len(claims)
+
+        if chunk_embs is not None:
+            stored = np.ascontiguousarray(chunk_embs, dtype=np.float32)
+            if stored.ndim == 2 and len(stored) == len(chunks):
+                embs = self._encode([response] + claims)
+                if stored.shape[1] == embs.shape[1]:
+                    stored = stored / np.clip(
+                        np.linalg.norm(stored, axis=1, keepdims=True), 1e-12, None,
+                    )
+                    return embs[0], embs[1:1 + n_claims], stored
+            logger.debug("Stored chunk embeddings do not match chunks – re-encoding.")
+
+        embs = self._encode([response] + claims + chunks)
+        return embs[0], embs[1:1 + n_claims], embs[1 + n_claims:]
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode *texts* into a 2-D float32 matrix, serving repeats from the
+        LRU cache and sending only the misses through the model in one batch.
+        """
+        if not texts:
+            dim = self._model.get_sentence_embedding_dimension() or 0
+            return np.empty((0, dim), dtype=np.float32)
+
+        keys  = [_text_key(t) for t in texts]
+        found : dict[bytes, np.ndarray] = {}
+        todo  : dict[bytes, str]        = {}
+
+        with self._cache_lock:
+            for key, text in zip(keys, texts):
+                emb = self._emb_cache.get(key)
+                if emb is not None:
+                    self._emb_cache.move_to_end(key)
+                    found[key] = emb
+                    self._cache_hits += 1
+                elif key not in todo:
+                    todo[key] = text
+                    self._cache_misses += 1
+
+        if todo:
+            fresh = self._encode_model(list(todo.values()))
+            if fresh.dtype != self._store_dtype:
+                fresh = fresh.astype(self._store_dtype)
+            found.update(zip(todo, fresh))
+
+            if self.cache_size > 0:
+                with self._cache_lock:
+                    for key in todo:
+                        self._emb_cache[key] = found[key]
+                    while len(self._emb_cache) > self.cache_size:
+                        self._emb_cache.popitem(last=False)
+
+        # half-precision rows are widened once here: numpy has no fp16 BLAS
+        return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+    def _encode_model(self, texts: list[str]) -> np.ndarray:
+        """Run the model, through the cross-request batcher when enabled."""
+        batcher = self._batcher
+        if batcher is not None:
+            try:
+                return batcher.encode(texts)
+            except _BatcherClosed:                 # closed concurrently
+                pass
+        return np.ascontiguousarray(
+            self._model.encode(
+                texts,
+                normalize_embeddings=True,
+                batch_size=min(len(texts), ENCODE_MAX_BATCH),
+                convert_to_numpy=True,
+            ),
+            dtype=np.float32,
+        )
 
     # ------------------------------------------------------------------
     # Signal implementations
@@ -221,47 +772,50 @@ class FaithfulnessScorer:
 
     # ---- 1. Semantic Similarity ----------------------------------------
 
-    def _semantic_similarity(self, response: str, chunks: list[str]) -> float:
+    @staticmethod
+    def _semantic_similarity_emb(resp_emb: np.ndarray, chunk_embs: np.ndarray) -> float:
         """Max cosine similarity between the response and any single chunk."""
-        try:
-            texts      = [response] + chunks
-            embeddings = self._model.encode(texts, normalize_embeddings=True)
-            resp_emb   = embeddings[0]
-            sims       = [float(np.dot(resp_emb, c)) for c in embeddings[1:]]
-            return max(max(sims), 0.0) if sims else 0.0
-        except Exception as exc:                           # pragma: no cover
-            logger.error("Semantic similarity failed: %s", exc)
+        if len(chunk_embs) == 0:
             return 0.0
+        sims = chunk_embs @ resp_emb
+        return max(float(sims.max()), 0.0)
 
     # ---- 2. Claim Coverage ---------------------------------------------
 
-    def _claim_coverage(
-        self, response: str, chunks: list[str], combined: str
+    @staticmethod
+    def _claim_coverage_emb(
+        claims:       list[str],
+        claim_tokens: list[np.ndarray],
+        claim_embs:   np.ndarray,
+        chunk_embs:   np.ndarray,
+        chunks:       list[str],
+        ctx_tokens:   Optional[np.ndarray] = None,
     ) -> float:
-        """Fraction of declarative claims that are supported."""
-        claims = _split_claims(response)
+        """
+        Fraction of declarative claims that are supported.  *ctx_tokens* is
+        built from *chunks* only if some claim needs the lexical fallback.
+        """
         if not claims:
             return 1.0                                     # nothing to contradict
 
-        ctx_tokens = _tokenise(combined)
-
-        try:
-            claim_embs = self._model.encode(claims,  normalize_embeddings=True)
-            chunk_embs = self._model.encode(chunks,  normalize_embeddings=True)
-        except Exception as exc:                           # pragma: no cover
-            logger.error("Claim encoding failed: %s", exc)
-            return 0.0
+        # one GEMM for every (claim, chunk) pair
+        best_sims = (
+            (claim_embs @ chunk_embs.T).max(axis=1)
+            if len(chunk_embs) else np.zeros(len(claims))
+        )
+        sem_ok    = best_sims >= CLAIM_SEM_THRESHOLD
 
         supported = 0
-        for claim, c_emb in zip(claims, claim_embs):
-            sims     = [float(np.dot(c_emb, ch)) for ch in chunk_embs]
-            best_sim = max(sims) if sims else 0.0
+        for tokens, ok in zip(claim_tokens, sem_ok):
+            if ok:
+                supported += 1
+                continue
 
             # lexical fallback
-            claim_toks  = _tokenise(claim)
-            lex_overlap = len(claim_toks & ctx_tokens) / max(len(claim_toks), 1)
-
-            if best_sim >= CLAIM_SEM_THRESHOLD or lex_overlap >= CLAIM_LEX_THRESHOLD:
+            if ctx_tokens is None:
+                ctx_tokens = _context_hashes(chunks)
+            lex_overlap = _lexical_overlap(tokens, ctx_tokens)
+            if lex_overlap >= CLAIM_LEX_THRESHOLD:
                 supported += 1
 
         return supported / len(claims)
@@ -269,12 +823,10 @@ class FaithfulnessScorer:
     # ---- 3. Numeric Consistency ----------------------------------------
 
     @staticmethod
-    def _numeric_consistency(response: str, combined_context: str) -> float:
+    def _numeric_consistency(resp_nums: frozenset[str], ctx_nums: frozenset[str]) -> float:
         """Fraction of response numbers that also appear in the context."""
-        resp_nums = _extract_numbers(response)
         if not resp_nums:
             return 1.0                                     # no numeric claims
-        ctx_nums  = _extract_numbers(combined_context)
         matched   = resp_nums & ctx_nums
         return len(matched) / len(resp_nums)
 
@@ -287,7 +839,10 @@ class FaithfulnessScorer:
         """
         if semantic_sim >= 0.55:                           # evidence is decent
             return 0.0
-        words      = set(re.findall(r"[a-z]+", response.lower()))
+        lowered = response.lower()
+        if not HEDGE_PATTERN.search(lowered):              # no hedging at all
+            return 0.0
+        words      = set(HEDGE_RE.findall(lowered))
         hedge_hits = len(words & HEDGE_WORDS)
         hedge_ratio = hedge_hits / max(len(words), 1)
         # scale 0 → 0, full hedge → hedge_max_penalty
@@ -297,30 +852,28 @@ class FaithfulnessScorer:
     # Per-claim detail  (for dashboards / audit)
     # ------------------------------------------------------------------
 
-    def _score_claims(
-        self, response: str, chunks: list[str], combined: str
+    @staticmethod
+    def _score_claims_emb(
+        claims:       list[str],
+        claim_tokens: list[np.ndarray],
+        claim_embs:   np.ndarray,
+        chunk_embs:   np.ndarray,
+        chunks:       list[str],
+        ctx_tokens:   np.ndarray,
     ) -> list[dict]:
         """Return per-claim grounding detail."""
-        claims = _split_claims(response)
         if not claims:
             return []
 
-        ctx_tokens = _tokenise(combined)
-        try:
-            claim_embs = self._model.encode(claims,  normalize_embeddings=True)
-            chunk_embs = self._model.encode(chunks,  normalize_embeddings=True)
-        except Exception as exc:                           # pragma: no cover
-            logger.error("Claim detail encoding failed: %s", exc)
-            return [{"claim": c, "supported": False, "error": str(exc)} for c in claims]
+        sim_matrix = claim_embs @ chunk_embs.T
+        best_idxs  = sim_matrix.argmax(axis=1)
+        best_sims  = sim_matrix[np.arange(len(claims)), best_idxs]
 
         out = []
-        for claim, c_emb in zip(claims, claim_embs):
-            sims     = [float(np.dot(c_emb, ch)) for ch in chunk_embs]
-            best_idx = int(np.argmax(sims))
-            best_sim = sims[best_idx]
-
-            claim_toks  = _tokenise(claim)
-            lex_overlap = len(claim_toks & ctx_tokens) / max(len(claim_toks), 1)
+        for claim, tokens, best_idx, best_sim in zip(
+            claims, claim_tokens, best_idxs.tolist(), best_sims.tolist(),
+        ):
+            lex_overlap = _lexical_overlap(tokens, ctx_tokens)
 
             supported = best_sim >= CLAIM_SEM_THRESHOLD or lex_overlap >= CLAIM_LEX_THRESHOLD
 
@@ -332,4 +885,4 @@ class FaithfulnessScorer:
                 "lexical_overlap":round(lex_overlap, 4),
                 "source_snippet": chunks[best_idx][:100] if supported else None,
             })
-        return out
\ No newline at end of file
+        return out
@@ -20,20 +20,31 @@ provider without hard coupling.
 
 from __future__ import annotations
 
+import os
 import time
-import uuid
+import asyncio
+import atexit
 import logging
 import json
+import secrets
+import threading
 from dataclasses import dataclass, field
 from typing import Callable, Optional
 from datetime import datetime, timezone
 
+try:                                               # C JSON encoder, optional
+    import orjson
+except ImportError:                                # pragma: no cover
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Lazy imports  –  heavy packages loaded only when the class is instantiated
 # ---------------------------------------------------------------------------
 _faithfulness_module = None
+_default_scorer      = None
+_default_scorer_lock = threading.Lock()
 
 
 def _get_faithfulness():
@@ -44,21 +55,35 @@ def _get_faithfulness():
     return _faithfulness_module
 
 
+def _get_default_scorer():
+    """
+    Process-wide default scorer, built on first use.  Pipelines created
+    without a scorer share it, so the model loads once instead of once per
+    pipeline (the scorer is thread-safe).
+    """
+    global _default_scorer
+    with _default_scorer_lock:
+        if _default_scorer is None:
+            _default_scorer = _get_faithfulness()()
+        return _default_scorer
+
+
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedChunk:
     """A single chunk as returned by the vector store."""
     chunk_id:   str
     text:       str
     score:      float                              # similarity score from ChromaDB
     metadata:   dict = field(default_factory=dict)
+    embedding:  Optional[list[float]] = None       # stored vector, when fetched
 
 
-@dataclass
+@dataclass(slots=True)
 class RAGResponse:
     """Everything the caller (or the FastAPI layer) needs."""
     request_id:          str
@@ -127,6 +152,18 @@ class RAGPipeline:
         Returned when all retries are exhausted.
     audit_log_path : str | None
         If set, each request's audit log is appended as one JSON line.
+        Each line is a single unbuffered ``O_APPEND`` write, so records
+        from several worker processes never interleave and nothing is
+        lost if the process is killed.  ``close()`` releases the file.
+    faithfulness_scorer : FaithfulnessScorer | None
+        Pre-built scorer to share (e.g. one configured for cross-request
+        encode batching).  When omitted, a default scorer shared by all
+        such pipelines is used.
+    reuse_store_embeddings : bool
+        Ask the vector store for the chunks' stored embeddings
+        (``include=[..., "embeddings"]``) and hand them to the scorer so it
+        only encodes the answer.  Only valid when the store was populated
+        with the scorer's embedding model.
     """
 
     FALLBACK = (
@@ -144,6 +181,8 @@ class RAGPipeline:
         max_context_chars:      int             = 6000,
         fallback_message:       Optional[str]   = None,
         audit_log_path:         Optional[str]   = None,
+        faithfulness_scorer:    Optional[object] = None,
+        reuse_store_embeddings: bool            = False,
     ):
         self.llm_fn                 = llm_fn
         self.vector_store           = vector_store
@@ -153,48 +192,157 @@ class RAGPipeline:
         self.max_context_chars      = max_context_chars
         self.fallback_message       = fallback_message or self.FALLBACK
         self.audit_log_path         = audit_log_path
+        self.reuse_store_embeddings = reuse_store_embeddings
+
+        # Audit file descriptor: opened on first write, kept open until close()
+        self._audit_fd   : Optional[int] = None
+        self._audit_lock = threading.Lock()
 
-        # Initialise faithfulness scorer  –  loads sentence-transformer once
-        FaithfulnessScorer       = _get_faithfulness()
-        self._faithfulness       = FaithfulnessScorer()
+        # Faithfulness scorer  –  the shared default loads the model once
+        if faithfulness_scorer is None:
+            faithfulness_scorer = _get_default_scorer()
+        self._faithfulness       = faithfulness_scorer
 
         logger.info(
             "RAGPipeline ready | threshold=%.2f retries=%d top_k=%d",
             faithfulness_threshold, max_retries, top_k,
         )
 
+    def close(self) -> None:
+        """Close the audit log file, if open."""
+        with self._audit_lock:
+            if self._audit_fd is not None:
+                os.close(self._audit_fd)
+                self._audit_fd = None
+                atexit.unregister(self.close)
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        True when the scorer's model is loaded and a vector store is
+        attached.  Cheap: never calls the model or the store, so callers
+        that need reachability (``/health``) still probe the store.
+        """
+        scorer = self._faithfulness
+        return (
+            scorer is not None
+            and getattr(scorer, "model_loaded", True)
+            and self.vector_store is not None
+        )
+
     # ------------------------------------------------------------------
     # Main entry-point
     # ------------------------------------------------------------------
 
-    def run(self, query: str) -> RAGResponse:
+    def run(self, query: str, where: Optional[dict] = None) -> RAGResponse:
         """
         Execute the full pipeline for a single user query.
 
+        Parameters
+        ----------
+        where : dict | None
+            ChromaDB metadata filter applied during retrieval, e.g.
+            ``AccessController.get_filter_metadata(user)`` so that chunks
+            the caller may not see are never retrieved.
+
         Returns
         -------
         RAGResponse
             ``answer`` is safe to surface to the user.
         """
-        request_id = str(uuid.uuid4())
-        start_ns   = time.perf_counter_ns()
+        start_ns = time.perf_counter_ns()
+        wall_ns  = time.time_ns()                      # anchors audit offsets
+        return self._answer(query, self._retrieve(query, where), start_ns, wall_ns)
+
+    def run_batch(
+        self,
+        queries: list[str],
+        where:   Optional[dict] = None,
+    ) -> list[RAGResponse]:
+        """
+        Execute the pipeline for several queries with one vector-store round
+        trip: all queries go to ChromaDB in a single ``query()`` call, then
+        each is generated and checked as in :meth:`run`.
+
+        ``latency_ms`` of each response excludes the shared retrieval.
+        *where* is applied to every query, as in :meth:`run`.
+        """
+        retrieved = self._retrieve_many(queries, where)
+        return [
+            self._answer(query, chunks, time.perf_counter_ns(), time.time_ns())
+            for query, chunks in zip(queries, retrieved)
+        ]
+
+    # ------------------------------------------------------------------
+    # Async entry-points
+    # ------------------------------------------------------------------
+
+    async def arun(self, query: str, where: Optional[dict] = None) -> RAGResponse:
+        """
+        :meth:`run` in a worker thread, so the blocking retrieval, LLM call
+        and scoring do not stall the event loop.
+        """
+        return await asyncio.to_thread(self.run, query, where)
+
+    async def arun_batch(
+        self,
+        queries: list[str],
+        where:   Optional[dict] = None,
+    ) -> list[RAGResponse]:
+        """
+        :meth:`run_batch` with the per-query generate + faithfulness loops
+        running concurrently in worker threads, so the LLM calls of
+        different queries overlap instead of running back to back.
+
+        Retries within one query stay sequential: each depends on the
+        previous attempt's score.
+        """
+        retrieved = await asyncio.to_thread(self._retrieve_many, queries, where)
+
+        def answer(query: str, chunks: list[RetrievedChunk]) -> RAGResponse:
+            return self._answer(query, chunks, time.perf_counter_ns(), time.time_ns())
+
+        return list(await asyncio.gather(*(
+            asyncio.to_thread(answer, query, chunks)
+            for query, chunks in zip(queries, retrieved)
+        )))
+
+    def _answer(
+        self,
+        query:    str,
+        chunks:   list[RetrievedChunk],
+        start_ns: int,
+        wall_ns:  int,
+    ) -> RAGResponse:
+        """Generate, faithfulness-check and audit an answer over *chunks*."""
+        request_id = secrets.token_hex(16)
         audit      : list[dict] = []
 
         # ---------------------------------------------------------- 1. retrieve
-        chunks = self._retrieve(query)
         audit.append(_log("RETRIEVE", f"{len(chunks)} chunks returned"))
 
         if not chunks:
             audit.append(_log("FALLBACK", "No chunks retrieved"))
             return _build_response(
                 request_id, query, self.fallback_message, self.fallback_message,
-                chunks, 0.0, False, 0, start_ns, audit,
+                chunks, 0.0, False, 0, start_ns, wall_ns, audit,
             )
 
         # ---------------------------------------------------------- 2. generate + faithfulness loop
         context_str = self._format_context(chunks)
         user_prompt = USER_PROMPT_TEMPLATE.format(context=context_str, question=query)
         chunk_texts = [c.text for c in chunks]
+        chunk_embs  = (
+            [c.embedding for c in chunks]
+            if all(c.embedding is not None for c in chunks) else None
+        )
+        # the context is fixed across retries – pin its embeddings before the
+        # first attempt so every attempt scores against the same matrix and
+        # a repeated answer is served from the scorer's score cache
+        if chunk_embs is None and self.max_retries > 0 and hasattr(
+            self._faithfulness, "precompute_chunks"
+        ):
+            chunk_embs = self._faithfulness.precompute_chunks(chunk_texts)
 
         raw_answer   = ""
         faithfulness = 0.0
@@ -207,7 +355,7 @@ class RAGPipeline:
             audit.append(_log("GENERATE", f"attempt {attempt + 1}, len={len(raw_answer)}"))
 
             # --- faithfulness check -------------------------------------
-            faithfulness = self._faithfulness.score(raw_answer, chunk_texts)
+            faithfulness = self._faithfulness.score(raw_answer, chunk_texts, chunk_embs)
             audit.append(_log(
                 "FAITHFULNESS",
                 f"score={faithfulness:.4f} threshold={self.faithfulness_threshold}",
@@ -229,7 +377,7 @@ class RAGPipeline:
         # ---------------------------------------------------------- 4. build + persist
         response = _build_response(
             request_id, query, final_answer, raw_answer,
-            chunks, faithfulness, passed, retries_used, start_ns, audit,
+            chunks, faithfulness, passed, retries_used, start_ns, wall_ns, audit,
         )
         self._persist_audit(response)
         return response
@@ -240,36 +388,60 @@ class RAGPipeline:
 
     # ---- retrieval ----------------------------------------------------
 
-    def _retrieve(self, query: str) -> list[RetrievedChunk]:
+    def _retrieve(self, query: str, where: Optional[dict] = None) -> list[RetrievedChunk]:
         """Query ChromaDB and normalise into RetrievedChunk list."""
-        try:
-            result = self.vector_store.query(
-                query_texts=[query],
-                n_results=self.top_k,
-            )
-            documents = result.get("documents", [[]])[0]
-            distances = result.get("distances",  [[]])[0]
-            metadatas = (
-                result.get("metadatas", [[]])[0]
-                if result.get("metadatas")
-                else [{}] * len(documents)
-            )
+        return self._retrieve_many([query], where)[0]
 
-            # ChromaDB default metric is L2; convert to [0,1] similarity
-            chunks = []
-            for idx, (doc, dist, meta) in enumerate(zip(documents, distances, metadatas)):
-                similarity = round(1.0 / (1.0 + dist), 4)
-                chunks.append(RetrievedChunk(
-                    chunk_id  = f"chunk_{idx}",
-                    text      = doc,
-                    score     = similarity,
-                    metadata  = meta or {},
-                ))
-            return chunks
+    def _retrieve_many(
+        self,
+        queries: list[str],
+        where:   Optional[dict] = None,
+    ) -> list[list[RetrievedChunk]]:
+        """One ChromaDB round trip for *queries*; one chunk list per query."""
+        try:
+            params = {"query_texts": list(queries), "n_results": self.top_k}
+            if where:
+                params["where"] = where
+            if self.reuse_store_embeddings:
+                params["include"] = ["documents", "distances", "metadatas", "embeddings"]
+            result = self.vector_store.query(**params)
+            return [self._parse_result(result, i) for i in range(len(queries))]
 
         except Exception as exc:
             logger.error("Retrieval failed: %s", exc)
-            return []
+            return [[] for _ in queries]
+
+    @staticmethod
+    def _parse_result(result: dict, i: int) -> list[RetrievedChunk]:
+        """Normalise the *i*-th query's rows of a ChromaDB result."""
+        documents = result.get("documents", [[]])[i]
+        distances = result.get("distances",  [[]])[i]
+        metadatas = (
+            result.get("metadatas", [[]])[i]
+            if result.get("metadatas")
+            else [{}] * len(documents)
+        )
+        embeddings = result.get("embeddings")
+        embeddings = (
+            embeddings[i]
+            if embeddings is not None and len(embeddings) > i and embeddings[i] is not None
+            else [None] * len(documents)
+        )
+
+        # ChromaDB default metric is L2; convert to [0,1] similarity
+        chunks = []
+        for idx, (doc, dist, meta, emb) in enumerate(
+            zip(documents, distances, metadatas, embeddings)
+        ):
+            similarity = round(1.0 / (1.0 + dist), 4)
+            chunks.append(RetrievedChunk(
+                chunk_id  = f"chunk_{idx}",
+                text      = doc,
+                score     = similarity,
+                metadata  = meta or {},
+                embedding = emb,
+            ))
+        return chunks
 
     # ---- prompt construction ------------------------------------------
 
@@ -278,31 +450,84 @@ class RAGPipeline:
         parts : list[str] = []
         budget = self.max_context_chars
         for chunk in chunks:
-            segment = f"[Chunk {chunk.chunk_id}] (relevance {chunk.score})\n{chunk.text}"
-            if len(segment) > budget:
+            # size the segment before building it: a chunk that does not fit
+            # is never copied into a throw-away string
+            header = f"[Chunk {chunk.chunk_id}] (relevance {chunk.score})\n"
+            size   = len(header) + len(chunk.text)
+            if size > budget:
                 logger.debug("Context budget exhausted after %d chars.", self.max_context_chars - budget)
                 break
-            parts.append(segment)
-            budget -= len(segment)
+            parts.append(header + chunk.text)
+            budget -= size
         return "\n\n".join(parts)
 
     # ---- audit --------------------------------------------------------
 
+    def audit_cache_hit(
+        self,
+        request_id: str,
+        query:      str,
+        tier:       str,
+        cached:     dict,
+        latency_ms: float,
+    ) -> None:
+        """
+        Record an answer served from an answer cache instead of ``run()``.
+
+        Parameters
+        ----------
+        request_id : str   – id returned to the caller for this request.
+        tier       : str   – cache tier that matched (``"exact"`` / ``"semantic"``).
+        cached     : dict  – the cached response payload; its ``request_id``
+                             names the request whose answer is reused.
+        """
+        self._write_audit({
+            "request_id":         request_id,
+            "query":              query,
+            "faithfulness_score": cached["faithfulness_score"],
+            "passed":             cached["passed_faithfulness"],
+            "retries":            0,
+            "latency_ms":         latency_ms,
+            "cache_tier":         tier,
+            "cached_request_id":  cached["request_id"],
+            "audit_log":          [{
+                "stage":     "CACHE_HIT",
+                "message":   f"{tier} hit, answer of request {cached['request_id']}",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }],
+        })
+
     def _persist_audit(self, response: RAGResponse) -> None:
+        """Append the request's audit record as one JSON line."""
+        self._write_audit({
+            "request_id":         response.request_id,
+            "query":              response.query,
+            "faithfulness_score": response.faithfulness_score,
+            "passed":             response.passed_faithfulness,
+            "retries":            response.retries_used,
+            "latency_ms":         response.latency_ms,
+            "audit_log":          response.audit_log,
+        })
+
+    def _write_audit(self, record: dict) -> None:
         if not self.audit_log_path:
             return
         try:
-            record = {
-                "request_id":         response.request_id,
-                "query":              response.query,
-                "faithfulness_score": response.faithfulness_score,
-                "passed":             response.passed_faithfulness,
-                "retries":            response.retries_used,
-                "latency_ms":         response.latency_ms,
-                "audit_log":          response.audit_log,
-            }
-            with open(self.audit_log_path, "a") as fh:
-                fh.write(json.dumps(record) + "\n")
+            line = (
+                orjson.dumps(record) if orjson is not None
+                else json.dumps(record).encode("utf-8")
+            ) + b"\n"
+            with self._audit_lock:
+                if self._audit_fd is None:
+                    self._audit_fd = os.open(
+                        self.audit_log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o640,
+                    )
+                    atexit.register(self.close)
+                # one write() per record: O_APPEND keeps whole lines atomic
+                # across processes sharing the file
+                written = os.write(self._audit_fd, line)
+                if written < len(line):
+                    os.write(self._audit_fd, line[written:])
         except Exception as exc:
             logger.error("Audit persist failed: %s", exc)
 
@@ -314,17 +539,28 @@ class RAGPipeline:
 
 def _log(stage: str, message: str) -> dict:
     return {
-        "stage":     stage,
-        "message":   message,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stage":   stage,
+        "message": message,
+        "t_ns":    time.perf_counter_ns(),             # formatted in _build_response
     }
 
 
 def _build_response(
     request_id, query, final_answer, raw_answer,
-    chunks, faithfulness, passed, retries, start_ns, audit,
+    chunks, faithfulness, passed, retries, start_ns, wall_ns, audit,
 ) -> RAGResponse:
     latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+    # Monotonic stamps become ISO-8601 wall-clock timestamps once per request
+    audit = [
+        {
+            "stage":     entry["stage"],
+            "message":   entry["message"],
+            "timestamp": datetime.fromtimestamp(
+                (wall_ns + entry["t_ns"] - start_ns) / 1e9, tz=timezone.utc,
+            ).isoformat(),
+        }
+        for entry in audit
+    ]
     return RAGResponse(
         request_id          = request_id,
         query               = query,
@@ -4,39 +4,98 @@ Handles document loading, parsing, and semantic chunking.
 """
 
 import logging
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 import hashlib
 import re
+from html import unescape
 
 # Document parsers
+import pypdf
 from pypdf import PdfReader
+try:
+    import fitz  # PyMuPDF: much faster PDF text extraction
+except ImportError:  # pragma: no cover
+    fitz = None
 from docx import Document as DocxDocument
 from bs4 import BeautifulSoup
 import markdown
+try:
+    from markdown_it import MarkdownIt  # renders Markdown without an HTML DOM
+except ImportError:  # pragma: no cover
+    MarkdownIt = None
+try:
+    import lxml  # noqa: F401  (C-backed BeautifulSoup parser)
+    _HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover
+    _HTML_PARSER = "html.parser"
+
+from src.ingestion.extraction_cache import ExtractionCache
 
 logger = logging.getLogger(__name__)
 
+# An HTML tag inside Markdown inline markup, e.g. "<span class='x'>"
+_TAG_RE = re.compile(r"<[^>]*>")
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentChunk:
-    """Represents a chunk of a document with metadata."""
+    """
+    Represents a chunk of a document with metadata.
+    
+    ``metadata`` holds only the per-chunk keys; the document-level
+    ``base_metadata`` dict is shared by every chunk of a document. Use
+    ``full_metadata`` for the merged view.
+    """
     content: str
     metadata: Dict[str, Any]
     chunk_id: str
     document_id: str
     chunk_index: int
+    base_metadata: Dict[str, Any] = field(default_factory=dict)
     
-    def __post_init__(self):
-        """Generate chunk ID if not provided."""
-        if not self.chunk_id:
-            self.chunk_id = self._generate_chunk_id()
+    @classmethod
+    def create(
+        cls,
+        content: str,
+        metadata: Dict[str, Any],
+        document_id: str,
+        chunk_index: int,
+        base_metadata: Optional[Dict[str, Any]] = None
+    ) -> "DocumentChunk":
+        """
+        Build a chunk, deriving its ID from a hash of the content.
+        
+        Args:
+            content: Chunk text
+            metadata: Per-chunk metadata
+            document_id: ID of the parent document
+            chunk_index: Position of the chunk within the document
+            base_metadata: Shared document-level metadata
+            
+        Returns:
+            DocumentChunk with ``chunk_id`` populated
+        """
+        content_hash = hashlib.blake2b(content.encode(), digest_size=4).hexdigest()
+        return cls(
+            content=content,
+            metadata=metadata,
+            chunk_id=f"{document_id}_chunk_{chunk_index}_{content_hash}",
+            document_id=document_id,
+            chunk_index=chunk_index,
+            base_metadata={} if base_metadata is None else base_metadata
+        )
     
-    def _generate_chunk_id(self) -> str:
-        """Generate unique chunk ID based on content hash."""
-        content_hash = hashlib.md5(self.content.encode()).hexdigest()[:8]
-        return f"{self.document_id}_chunk_{self.chunk_index}_{content_hash}"
+    @property
+    def full_metadata(self) -> Dict[str, Any]:
+        """Document metadata merged with the per-chunk keys (new dict)."""
+        return {**self.base_metadata, **self.metadata}
 
 
 class DocumentProcessor:
@@ -45,12 +104,19 @@ class DocumentProcessor:
     Supports multiple file formats with configurable chunking strategy.
     """
     
+    # Sentence boundary: whitespace following terminal punctuation
+    _SENT_RE = re.compile(r'(?<=[.!?])\s+')
+    
+    # Text files at least this large are memory-mapped instead of read whole
+    _MMAP_MIN_BYTES = 256 * 1024
+    
     def __init__(
         self,
         chunk_size: int = 512,
         chunk_overlap: int = 50,
         min_chunk_size: int = 100,
-        max_chunk_size: int = 1000
+        max_chunk_size: int = 1000,
+        cache_dir: Optional[str] = None
     ):
         """
         Initialize document processor.
@@ -60,11 +126,15 @@ class DocumentProcessor:
             chunk_overlap: Overlap between chunks to maintain context
             min_chunk_size: Minimum chunk size to create
             max_chunk_size: Maximum chunk size allowed
+            cache_dir: Directory for the extracted-text cache (None disables)
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.min_chunk_size = min_chunk_size
         self.max_chunk_size = max_chunk_size
+        self.cache_dir = cache_dir
+        self.cache = ExtractionCache(cache_dir) if cache_dir else None
+        self._md = MarkdownIt("commonmark").enable("table") if MarkdownIt else None
         
         logger.info(
             f"Initialized DocumentProcessor: chunk_size={chunk_size}, "
@@ -81,6 +151,33 @@ class DocumentProcessor:
         Returns:
             Dictionary with document content and metadata
             
+        Raises:
+            ValueError: If file format is not supported
+        """
+        metadata, segments = self.open_document(file_path)
+        content = "\n\n".join(segments)
+        
+        logger.info(f"Loaded document: {metadata['filename']} ({len(content)} characters)")
+        
+        return {
+            "content": content,
+            "metadata": metadata
+        }
+    
+    def open_document(self, file_path: str) -> Tuple[Dict[str, Any], Iterator[str]]:
+        """
+        Open a document for streaming.
+        
+        The document's text is produced lazily as segments (PDF pages, DOCX
+        paragraphs, ~1 MB blocks of a text file) that, joined with blank
+        lines, equal ``load_document()``'s content.
+        
+        Args:
+            file_path: Path to document file
+            
+        Returns:
+            Tuple of (metadata dictionary, iterator of text segments)
+            
         Raises:
             ValueError: If file format is not supported
         """
@@ -92,19 +189,21 @@ class DocumentProcessor:
         # Determine file type and parse
         suffix = path.suffix.lower()
         
-        if suffix == ".txt":
-            content = self._load_txt(path)
-        elif suffix == ".pdf":
-            content = self._load_pdf(path)
-        elif suffix == ".docx":
-            content = self._load_docx(path)
-        elif suffix == ".md":
-            content = self._load_markdown(path)
-        elif suffix == ".html":
-            content = self._load_html(path)
-        else:
+        loader = self._LOADERS.get(suffix)
+        if loader is None:
             raise ValueError(f"Unsupported file format: {suffix}")
         
+        if self.cache is None:
+            segments = iter(loader(self, path))
+        else:
+            cache_key = self.cache.key(path, self._extractor_id(suffix, loader))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Extraction cache hit for {path.name}")
+                segments = iter(cached)
+            else:
+                segments = self._cache_segments(cache_key, path, loader(self, path))
+        
         # Generate document ID
         doc_id = self._generate_document_id(path)
         
@@ -116,52 +215,190 @@ class DocumentProcessor:
             "document_id": doc_id
         }
         
-        logger.info(f"Loaded document: {path.name} ({len(content)} characters)")
-        
-        return {
-            "content": content,
-            "metadata": metadata
-        }
+        return metadata, segments
+    
+    def _extractor_id(self, suffix: str, loader: Callable) -> str:
+        """Loader and backend (with version) that extract a file type, for cache keys."""
+        backend = ""
+        if suffix == ".pdf":
+            backend = (
+                f"pymupdf-{getattr(fitz, 'VersionBind', '')}" if fitz is not None
+                else f"pypdf-{getattr(pypdf, '__version__', '')}"
+            )
+        elif suffix == ".md":
+            backend = "markdown-it" if self._md is not None else "markdown"
+        elif suffix == ".html":
+            backend = _HTML_PARSER
+        return f"{loader.__module__}.{loader.__qualname__}:{backend}"
     
-    def _load_txt(self, path: Path) -> str:
-        """Load plain text file."""
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+    def _cache_segments(
+        self,
+        cache_key: str,
+        path: Path,
+        segments: Iterable[str]
+    ) -> Iterator[str]:
+        """Pass segments through, storing them once the loader is exhausted."""
+        collected = []
+        for segment in segments:
+            collected.append(segment)
+            yield segment
+        self.cache.put(cache_key, collected, path)
     
-    def _load_pdf(self, path: Path) -> str:
-        """Load PDF file."""
-        reader = PdfReader(path)
-        text_parts = []
+    def _iter_txt(self, path: Path, block_size: int = 1 << 20) -> Iterator[str]:
+        """Read a text file in blocks, cutting only at blank lines."""
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size or size < self._MMAP_MIN_BYTES:
+                # Small file: one read, one decode
+                yield self._decode_text(f.read(), first=True)
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                buf = ""
+                start = 0
+                while start < size:
+                    # Decode whole lines only, so no UTF-8 sequence or
+                    # CRLF pair straddles two blocks
+                    end = start + block_size
+                    if end < size:
+                        nl = mm.rfind(b"\n", start, end)
+                        if nl < 0:
+                            nl = mm.find(b"\n", end)
+                        end = nl + 1 if nl >= 0 else size
+                    else:
+                        end = size
+                    buf += self._decode_text(mm[start:end], first=start == 0)
+                    start = end
+                    
+                    cut = buf.rfind("\n\n")
+                    if cut >= 0:
+                        yield buf[:cut]
+                        buf = buf[cut + 2:]
+                yield buf
+    
+    @staticmethod
+    def _decode_text(data: bytes, first: bool = False) -> str:
+        """Decode UTF-8 bytes with universal newlines, dropping a leading BOM."""
+        text = data.decode('utf-8', errors='ignore')
+        if first:
+            text = text.removeprefix('\ufeff')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    
+    def _iter_pdf(self, path: Path) -> Iterator[str]:
+        """Yield non-empty PDF page texts (PyMuPDF when installed, pypdf otherwise)."""
+        doc = None
+        if fitz is not None:
+            try:
+                doc = fitz.open(path)
+                if doc.needs_pass:
+                    raise ValueError("document is encrypted")
+            except Exception as e:
+                # pypdf may still handle files PyMuPDF rejects
+                logger.warning(f"PyMuPDF failed on {path.name}, falling back to pypdf: {e}")
+                if doc is not None:
+                    doc.close()
+                doc = None
+        
+        if doc is not None:
+            with doc:
+                for page in doc:
+                    text = page.get_text("text")
+                    if text.strip():
+                        yield text
+            return
         
-        for page_num, page in enumerate(reader.pages, 1):
+        reader = PdfReader(path)
+        for page in reader.pages:
             text = page.extract_text()
             if text.strip():
-                text_parts.append(text)
-        
-        return "\n\n".join(text_parts)
+                yield text
     
-    def _load_docx(self, path: Path) -> str:
-        """Load DOCX file."""
+    def _iter_docx(self, path: Path) -> Iterator[str]:
+        """Yield non-empty DOCX paragraphs."""
         doc = DocxDocument(path)
-        paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
-        return "\n\n".join(paragraphs)
+        for para in doc.paragraphs:
+            if para.text.strip():
+                yield para.text
+    
+    def _iter_markdown(self, path: Path) -> List[str]:
+        """Markdown text as a single segment."""
+        return [self._load_markdown(path)]
+    
+    def _iter_html(self, path: Path) -> List[str]:
+        """HTML text as a single segment."""
+        return [self._load_html(path)]
+    
+    # File suffix -> loader yielding the document's text segments
+    _LOADERS: Dict[str, Callable[["DocumentProcessor", Path], Iterable[str]]] = {
+        ".txt": _iter_txt,
+        ".pdf": _iter_pdf,
+        ".docx": _iter_docx,
+        ".md": _iter_markdown,
+        ".html": _iter_html
+    }
+    
+    @classmethod
+    def register_loader(
+        cls,
+        suffix: str,
+        loader: Callable[["DocumentProcessor", Path], Iterable[str]]
+    ) -> None:
+        """
+        Register (or replace) the loader for a file suffix.
+        
+        Worker processes started with ``spawn`` re-import this module, so
+        register loaders at import time of a module they also import.
+        
+        Args:
+            suffix: File suffix including the dot, e.g. '.rtf'
+            loader: Callable taking (processor, path) and returning text
+                segments whose blank-line join is the document text
+        """
+        # Copy so registering on a subclass leaves the parent untouched
+        cls._LOADERS = {**cls._LOADERS, suffix.lower(): loader}
     
     def _load_markdown(self, path: Path) -> str:
         """Load Markdown file and convert to plain text."""
         with open(path, 'r', encoding='utf-8') as f:
             md_content = f.read()
         
-        # Convert markdown to HTML, then extract text
-        html = markdown.markdown(md_content)
-        soup = BeautifulSoup(html, 'html.parser')
-        return soup.get_text(separator='\n\n')
+        if self._md is None:
+            # Convert markdown to HTML, then extract text
+            html = markdown.markdown(md_content)
+            soup = BeautifulSoup(html, _HTML_PARSER)
+            return soup.get_text(separator='\n\n')
+        
+        # Collect the text of each block straight from the token stream
+        blocks = []
+        for token in self._md.parse(md_content):
+            if token.type == "inline":
+                parts = []
+                for child in token.children or ():
+                    if child.type in ("text", "code_inline"):
+                        parts.append(child.content)
+                    elif child.type == "html_inline":
+                        # Inline tags arrive one per token; keep no markup
+                        parts.append(unescape(_TAG_RE.sub("", child.content)))
+                    elif child.type in ("softbreak", "hardbreak"):
+                        parts.append("\n")
+                blocks.append("".join(parts))
+            elif token.type in ("fence", "code_block"):
+                blocks.append(token.content.rstrip("\n"))
+            elif token.type == "html_block":
+                # Raw HTML keeps its text, as the markdown -> HTML path did
+                soup = BeautifulSoup(token.content, _HTML_PARSER)
+                blocks.append(soup.get_text(separator='\n\n').strip())
+        
+        return "\n\n".join(block for block in blocks if block.strip())
     
     def _load_html(self, path: Path) -> str:
         """Load HTML file and extract text."""
         with open(path, 'r', encoding='utf-8') as f:
             html_content = f.read()
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
         
         # Remove script and style elements
         for script in soup(["script", "style"]):
@@ -172,7 +409,25 @@ class DocumentProcessor:
     def _generate_document_id(self, path: Path) -> str:
         """Generate unique document ID based on file path."""
         path_str = str(path.absolute())
-        doc_hash = hashlib.md5(path_str.encode()).hexdigest()[:12]
+        doc_hash = hashlib.blake2b(path_str.encode(), digest_size=6).hexdigest()
+        return f"doc_{doc_hash}"
+    
+    @staticmethod
+    def legacy_document_id(file_path: str) -> str:
+        """
+        Document ID older versions derived from the path with MD5.
+        
+        Only used to find and remove chunks stored under the old IDs when
+        a file is re-ingested.
+        
+        Args:
+            file_path: Path to document file
+            
+        Returns:
+            Legacy document ID
+        """
+        path_str = str(Path(file_path).absolute())
+        doc_hash = hashlib.md5(path_str.encode(), usedforsecurity=False).hexdigest()[:12]
         return f"doc_{doc_hash}"
     
     def chunk_document(
@@ -190,22 +445,62 @@ class DocumentProcessor:
         Returns:
             List of DocumentChunk objects
         """
-        content = document["content"]
-        base_metadata = document["metadata"].copy()
+        return list(self.chunk_stream(
+            [document["content"]],
+            document["metadata"],
+            metadata_override
+        ))
+    
+    def chunk_stream(
+        self,
+        segments: Iterable[str],
+        metadata: Dict[str, Any],
+        metadata_override: Optional[Dict[str, Any]] = None
+    ) -> Iterator[DocumentChunk]:
+        """
+        Lazily split a stream of text segments into semantic chunks.
+        
+        Segments are treated as if joined by blank lines, so chunking a
+        document page by page gives the same chunks as ``chunk_document``
+        while holding only the current chunk in memory.
+        
+        Args:
+            segments: Text segments, e.g. from ``open_document``
+            metadata: Document metadata (must include 'document_id')
+            metadata_override: Optional metadata to override/extend
+            
+        Yields:
+            DocumentChunk objects as each chunk closes
+        """
+        base_metadata = metadata.copy()
         
         if metadata_override:
             base_metadata.update(metadata_override)
         
         # Split into sentences/paragraphs first
-        text_splits = self._split_text(content)
+        splits = (split for segment in segments for split in self._split_text(segment))
+        
+        count = 0
+        for chunk in self._chunk_splits(splits, base_metadata):
+            count += 1
+            yield chunk
         
+        logger.info(
+            f"Created {count} chunks from document {base_metadata.get('filename', 'unknown')}"
+        )
+    
+    def _chunk_splits(
+        self,
+        splits: Iterable[str],
+        base_metadata: Dict[str, Any]
+    ) -> Iterator[DocumentChunk]:
+        """Merge text splits into overlapping chunks."""
         # Create chunks with overlap
-        chunks = []
         current_chunk = []
         current_length = 0
         chunk_index = 0
         
-        for split in text_splits:
+        for split in splits:
             split_length = len(split)
             
             # If single split is too large, force split it
@@ -213,11 +508,11 @@ class DocumentProcessor:
                 if current_chunk:
                     # Save current chunk first
                     chunk_text = " ".join(current_chunk)
-                    chunks.append(self._create_chunk(
+                    yield self._create_chunk(
                         chunk_text,
                         base_metadata,
                         chunk_index
-                    ))
+                    )
                     chunk_index += 1
                     current_chunk = []
                     current_length = 0
@@ -225,11 +520,11 @@ class DocumentProcessor:
                 # Force split large text
                 forced_chunks = self._force_split(split)
                 for forced_chunk in forced_chunks:
-                    chunks.append(self._create_chunk(
+                    yield self._create_chunk(
                         forced_chunk,
                         base_metadata,
                         chunk_index
-                    ))
+                    )
                     chunk_index += 1
                 continue
             
@@ -238,11 +533,11 @@ class DocumentProcessor:
                 # Save current chunk
                 chunk_text = " ".join(current_chunk)
                 if len(chunk_text) >= self.min_chunk_size:
-                    chunks.append(self._create_chunk(
+                    yield self._create_chunk(
                         chunk_text,
                         base_metadata,
                         chunk_index
-                    ))
+                    )
                     chunk_index += 1
                 
                 # Keep overlap
@@ -257,17 +552,11 @@ class DocumentProcessor:
         if current_chunk:
             chunk_text = " ".join(current_chunk)
             if len(chunk_text) >= self.min_chunk_size:
-                chunks.append(self._create_chunk(
+                yield self._create_chunk(
                     chunk_text,
                     base_metadata,
                     chunk_index
-                ))
-        
-        logger.info(
-            f"Created {len(chunks)} chunks from document {base_metadata.get('filename', 'unknown')}"
-        )
-        
-        return chunks
+                )
     
     def _split_text(self, text: str) -> List[str]:
         """
@@ -293,8 +582,10 @@ class DocumentProcessor:
                 splits.append(para)
             else:
                 # Split by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', para)
-                splits.extend([s.strip() for s in sentences if s.strip()])
+                for sentence in self._SENT_RE.split(para):
+                    sentence = sentence.strip()
+                    if sentence:
+                        splits.append(sentence)
         
         return splits
     
@@ -332,23 +623,22 @@ class DocumentProcessor:
         metadata: Dict[str, Any],
         chunk_index: int
     ) -> DocumentChunk:
-        """Create DocumentChunk object."""
-        chunk_metadata = metadata.copy()
-        chunk_metadata["chunk_index"] = chunk_index
-        chunk_metadata["chunk_length"] = len(content)
-        
-        return DocumentChunk(
-            content=content.strip(),
-            metadata=chunk_metadata,
-            chunk_id="",  # Will be auto-generated
+        """Create DocumentChunk object sharing the document's metadata dict."""
+        content = content.strip()
+        
+        return DocumentChunk.create(
+            content=content,
+            metadata={"chunk_index": chunk_index, "chunk_length": len(content)},
             document_id=metadata["document_id"],
-            chunk_index=chunk_index
+            chunk_index=chunk_index,
+            base_metadata=metadata
         )
     
     def process_documents(
         self,
         file_paths: List[str],
-        batch_metadata: Optional[Dict[str, Any]] = None
+        batch_metadata: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None
     ) -> List[DocumentChunk]:
         """
         Process multiple documents.
@@ -356,30 +646,103 @@ class DocumentProcessor:
         Args:
             file_paths: List of document file paths
             batch_metadata: Metadata to apply to all documents
+            max_workers: Worker processes (default: CPU count; 1 = in-process)
             
         Returns:
             List of all document chunks
         """
-        all_chunks = []
-        
-        for i, file_path in enumerate(file_paths, 1):
-            try:
-                logger.info(f"Processing document {i}/{len(file_paths)}: {file_path}")
-                
-                # Load document
-                document = self.load_document(file_path)
-                
-                # Chunk document
-                chunks = self.chunk_document(document, batch_metadata)
-                all_chunks.extend(chunks)
-                
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {str(e)}")
-                continue
+        all_chunks = list(self.iter_chunks(file_paths, batch_metadata, max_workers))
         
         logger.info(f"Processed {len(file_paths)} documents into {len(all_chunks)} chunks")
         
         return all_chunks
+    
+    def iter_chunks(
+        self,
+        file_paths: List[str],
+        batch_metadata: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None
+    ) -> Iterator[DocumentChunk]:
+        """
+        Lazily process multiple documents, yielding chunks as files finish.
+        
+        Files share no state, so they are parsed and chunked in parallel
+        worker processes; chunks are yielded in input-file order. At most
+        two files per worker are in flight, so memory stays bounded however
+        slowly the consumer drains chunks. In-process (one worker) a file is
+        streamed segment by segment; chunks yielded before an error in a
+        file are kept.
+        
+        Workers build an instance of this processor's class, so loaders
+        registered on a subclass apply there too; such subclasses must
+        accept the base constructor arguments.
+        
+        Args:
+            file_paths: List of document file paths
+            batch_metadata: Metadata to apply to all documents
+            max_workers: Worker processes (default: CPU count; 1 = in-process)
+            
+        Yields:
+            Document chunks
+        """
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        
+        if workers <= 1:
+            for i, file_path in enumerate(file_paths, 1):
+                logger.info(f"Processing document {i}/{len(file_paths)}: {file_path}")
+                try:
+                    metadata, segments = self.open_document(file_path)
+                    yield from self.chunk_stream(segments, metadata, batch_metadata)
+                except Exception as e:
+                    logger.error(f"Error processing {file_path}: {str(e)}")
+        else:
+            logger.info(f"Processing {len(file_paths)} documents with {workers} workers")
+            config = {
+                "chunk_size": self.chunk_size,
+                "chunk_overlap": self.chunk_overlap,
+                "min_chunk_size": self.min_chunk_size,
+                "max_chunk_size": self.max_chunk_size,
+                "cache_dir": self.cache_dir
+            }
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Sliding window: submit the next file only as one is consumed
+                pending = deque()
+                paths = iter(file_paths)
+                for file_path in islice(paths, 2 * workers):
+                    pending.append(executor.submit(
+                        _process_one, type(self), file_path, config, batch_metadata
+                    ))
+                while pending:
+                    chunks = pending.popleft().result()
+                    for file_path in islice(paths, 1):
+                        pending.append(executor.submit(
+                            _process_one, type(self), file_path, config, batch_metadata
+                        ))
+                    yield from chunks
+                    del chunks
+    
+    def _process_file(
+        self,
+        file_path: str,
+        batch_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[DocumentChunk]:
+        """Load and chunk one file; errors are logged and yield no chunks."""
+        try:
+            metadata, segments = self.open_document(file_path)
+            return list(self.chunk_stream(segments, metadata, batch_metadata))
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {str(e)}")
+            return []
+
+
+def _process_one(
+    processor_cls: type,
+    file_path: str,
+    config: Dict[str, Any],
+    batch_metadata: Optional[Dict[str, Any]]
+) -> List[DocumentChunk]:
+    """Worker-process entry point for DocumentProcessor.iter_chunks."""
+    return processor_cls(**config)._process_file(file_path, batch_metadata)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""
+Content-addressed cache of extracted document text.
+Lets repeated ingestion runs skip re-parsing files that have not changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when a loader's output changes so stale extractions are not reused
+CACHE_VERSION = 1
+
+
+class ExtractionCache:
+    """
+    Disk cache mapping a file's content hash to its extracted text segments.
+
+    Entries are keyed on a BLAKE2b digest of the file bytes and the
+    extractor that produced the text, so renamed or moved files still hit
+    while edited files, or a switch of extraction backend, miss. Each entry
+    is a small JSON file written atomically, which makes the cache safe to
+    share between parallel ingestion workers.
+
+    Entries hold the plain text of every document, including restricted
+    ones, so the cache directory is created readable by its owner only.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize extraction cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (created on demand,
+                mode 0o700)
+        """
+        root = Path(cache_dir).expanduser()
+        root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.cache_dir = root / f"v{CACHE_VERSION}"
+        self.cache_dir.mkdir(mode=0o700, exist_ok=True)
+
+    def key(self, path: Path, extractor: str = "") -> str:
+        """
+        Compute the cache key for a file.
+
+        Args:
+            path: Path to document file
+            extractor: Identifier (and version) of the extraction backend
+
+        Returns:
+            Hex digest of the file contents and extractor, suffixed with
+            the file type
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(b"\0" + extractor.encode("utf-8"))
+        return f"{digest.hexdigest()}{path.suffix.lower()}"
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Look up extracted segments.
+
+        Args:
+            key: Cache key from ``key()``
+
+        Returns:
+            List of text segments, or None on a miss
+        """
+        try:
+            with open(self.cache_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)["segments"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable extraction cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, segments: List[str], path: Path):
+        """
+        Store extracted segments.
+
+        Args:
+            key: Cache key from ``key()``
+            segments: Text segments produced by the loader
+            path: Source file, recorded for inspection
+        """
+        stat = path.stat()
+        entry = {
+            "segments": segments,
+            "source": str(path),
+            "file_size": stat.st_size,
+            "mtime": stat.st_mtime
+        }
+
+        target = self.cache_dir / f"{key}.json"
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.warning(f"Could not write extraction cache entry {key}: {e}")
+            tmp.unlink(missing_ok=True)
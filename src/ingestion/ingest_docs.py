@@ -4,7 +4,9 @@ Orchestrates document processing and vector storage.
 """
 
 import logging
+import os
 import yaml
+from itertools import islice
 from pathlib import Path
 from typing import List, Optional
 import sys
@@ -15,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.ingestion.document_processor import DocumentProcessor, DocumentChunk
 from src.retrieval.vector_store import VectorStoreManager
+from src.security.access_control import AccessController, ClearanceLevel
 
 # Configure logging
 logging.basicConfig(
@@ -30,22 +33,26 @@ class DocumentIngestor:
     Handles processing, chunking, and storage of documents.
     """
     
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", use_cache: bool = True):
         """
         Initialize document ingestor.
         
         Args:
             config_path: Path to configuration file
+            use_cache: Reuse previously extracted text of unchanged files
         """
         self.config = self._load_config(config_path)
         
         # Initialize document processor
         doc_config = self.config.get("document_processing", {})
+        self.max_workers = doc_config.get("max_workers")
+        self.ingest_batch_size = doc_config.get("ingest_batch_size", 512)
         self.processor = DocumentProcessor(
             chunk_size=doc_config.get("chunk_size", 512),
             chunk_overlap=doc_config.get("chunk_overlap", 50),
             min_chunk_size=doc_config.get("min_chunk_size", 100),
-            max_chunk_size=doc_config.get("max_chunk_size", 1000)
+            max_chunk_size=doc_config.get("max_chunk_size", 1000),
+            cache_dir=doc_config.get("extraction_cache_dir") if use_cache else None
         )
         
         # Initialize vector store
@@ -101,13 +108,24 @@ class DocumentIngestor:
                 [".txt", ".pdf", ".docx", ".md", ".html"]
             )
         
-        # Find all matching files
+        # Find all matching files in a single pass over the tree,
+        # skipping hidden directories
+        exts = {ext.lower() for ext in file_extensions}
         file_paths = []
-        for ext in file_extensions:
-            if recursive:
-                file_paths.extend(dir_path.rglob(f"*{ext}"))
-            else:
-                file_paths.extend(dir_path.glob(f"*{ext}"))
+        if recursive:
+            for root, dirs, files in os.walk(dir_path):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                file_paths.extend(
+                    os.path.join(root, f) for f in files
+                    if os.path.splitext(f)[1].lower() in exts
+                )
+        else:
+            with os.scandir(dir_path) as entries:
+                file_paths.extend(
+                    entry.path for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in exts
+                )
+        file_paths.sort()
         
         logger.info(f"Found {len(file_paths)} documents to ingest")
         
@@ -116,7 +134,7 @@ class DocumentIngestor:
             return 0
         
         # Process documents
-        return self.ingest_files([str(p) for p in file_paths], metadata=metadata)
+        return self.ingest_files(file_paths, metadata=metadata)
     
     def ingest_files(
         self,
@@ -139,22 +157,32 @@ class DocumentIngestor:
         
         logger.info(f"Starting ingestion of {len(file_paths)} files")
         
-        # Process documents into chunks
-        all_chunks = self.processor.process_documents(
+        # Chunk and document IDs were once MD5-based; drop copies of these
+        # files stored under the old IDs so re-ingesting does not duplicate them
+        self.vector_store.delete_by_document_ids(
+            [DocumentProcessor.legacy_document_id(path) for path in file_paths]
+        )
+        
+        # Stream chunks into the vector store in fixed-size batches, so
+        # embedding starts while later files are still being parsed; memory
+        # is bounded by one batch plus the files the workers have in flight
+        chunks = self.processor.iter_chunks(
             file_paths,
-            batch_metadata=metadata
+            batch_metadata=metadata,
+            max_workers=self.max_workers
         )
         
-        if not all_chunks:
+        chunk_count = 0
+        added_count = 0
+        while batch := list(islice(chunks, self.ingest_batch_size)):
+            chunk_count += len(batch)
+            vector_docs = self._prepare_chunks_for_storage(batch)
+            added_count += self.vector_store.add_documents(vector_docs)
+        
+        if not chunk_count:
             logger.warning("No chunks created from documents")
             return 0
         
-        # Prepare chunks for vector store
-        vector_docs = self._prepare_chunks_for_storage(all_chunks)
-        
-        # Add to vector store
-        added_count = self.vector_store.add_documents(vector_docs)
-        
         logger.info(f"Ingestion complete: {added_count} chunks added to vector store")
         
         return added_count
@@ -166,6 +194,9 @@ class DocumentIngestor:
         """
         Convert DocumentChunk objects to format expected by vector store.
         
+        Access-control metadata is normalised so the store can apply
+        ``AccessController.get_filter_metadata`` filters at query time.
+        
         Args:
             chunks: List of DocumentChunk objects
             
@@ -178,11 +209,65 @@ class DocumentIngestor:
             vector_docs.append({
                 "id": chunk.chunk_id,
                 "content": chunk.content,
-                "metadata": chunk.metadata
+                "metadata": AccessController.storage_metadata(chunk.full_metadata)
             })
         
         return vector_docs
     
+    def backfill_access_metadata(self, batch_size: int = 1000) -> int:
+        """
+        Add the filterable access-control keys to chunks stored without them.
+        
+        Query-time ``where`` filters need ``clearance_level_n``,
+        ``required_roles`` and ``allowed_departments`` on every chunk, and
+        ChromaDB cannot match missing keys, so chunks ingested before those
+        keys existed are never retrieved until they are backfilled (or the
+        collection is re-ingested with ``--reset``). A clearance level that
+        no longer exists is mapped to the highest level (fail closed).
+        
+        Args:
+            batch_size: Number of chunks read and updated per round trip
+            
+        Returns:
+            Number of chunks updated
+        """
+        collection = self.vector_store.collection
+        updated = 0
+        offset = 0
+        
+        while True:
+            page = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            ids = page["ids"]
+            if not ids:
+                break
+            offset += len(ids)
+            
+            stale_ids, stale_metadata = [], []
+            for chunk_id, metadata in zip(ids, page["metadatas"]):
+                metadata = metadata or {}
+                if "clearance_level_n" in metadata:
+                    continue
+                try:
+                    stored = AccessController.storage_metadata(metadata)
+                except (KeyError, ValueError):
+                    logger.warning(
+                        f"Unknown clearance level {metadata.get('clearance_level')!r} "
+                        f"on chunk {chunk_id}; restricting to {ClearanceLevel.TOP_SECRET.name}"
+                    )
+                    stored = AccessController.storage_metadata(
+                        {**metadata, "clearance_level": ClearanceLevel.TOP_SECRET}
+                    )
+                stale_ids.append(chunk_id)
+                stale_metadata.append(stored)
+            
+            if stale_ids:
+                collection.update(ids=stale_ids, metadatas=stale_metadata)
+                updated += len(stale_ids)
+        
+        logger.info(f"Backfilled access-control metadata on {updated} chunks")
+        
+        return updated
+    
     def get_stats(self) -> dict:
         """Get ingestion statistics."""
         return {
@@ -198,6 +283,7 @@ def main():
     parser.add_argument(
         "directory",
         type=str,
+        nargs="?",
         help="Directory containing documents to ingest"
     )
     parser.add_argument(
@@ -216,11 +302,30 @@ def main():
         action="store_true",
         help="Reset vector store before ingestion"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-extract every file instead of using the extraction cache"
+    )
+    
+    parser.add_argument(
+        "--backfill-acl",
+        action="store_true",
+        help="Add access-control filter keys to chunks ingested by older versions"
+    )
     
     args = parser.parse_args()
+    if args.directory is None and not args.backfill_acl:
+        parser.error("directory is required unless --backfill-acl is given")
     
     # Initialize ingestor
-    ingestor = DocumentIngestor(config_path=args.config)
+    ingestor = DocumentIngestor(config_path=args.config, use_cache=not args.no_cache)
+    
+    if args.backfill_acl:
+        updated = ingestor.backfill_access_metadata()
+        print(f"Backfilled access-control metadata on {updated} chunks")
+        if args.directory is None:
+            return
     
     # Reset if requested
     if args.reset:
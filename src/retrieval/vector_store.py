@@ -217,6 +217,21 @@ class VectorStoreManager:
         
         return formatted_results
     
+    def delete_by_document_ids(self, document_ids: List[str], batch_size: int = 500) -> None:
+        """
+        Delete every chunk belonging to the given documents.
+        
+        Args:
+            document_ids: Values of the chunks' ``document_id`` metadata
+            batch_size: Number of document IDs per delete call
+        """
+        for i in range(0, len(document_ids), batch_size):
+            batch = document_ids[i:i + batch_size]
+            try:
+                self.collection.delete(where={"document_id": {"$in": batch}})
+            except Exception as e:
+                logger.error(f"Error deleting documents: {str(e)}")
+    
     def get_collection_size(self) -> int:
         """Get number of documents in collection."""
         try:
@@ -268,7 +283,8 @@ class VectorStoreManager:
     def batch_search(
         self,
         queries: List[str],
-        k: int = 5
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform batch search for multiple queries.
@@ -276,6 +292,7 @@ class VectorStoreManager:
         Args:
             queries: List of query strings
             k: Number of results per query
+            filter_metadata: Optional metadata filters applied to every query
             
         Returns:
             List of search result dictionaries
@@ -283,7 +300,7 @@ class VectorStoreManager:
         results = []
         
         for query in queries:
-            result = self.search(query, k=k)
+            result = self.search(query, k=k, filter_metadata=filter_metadata)
             results.append(result)
         
         return results
@@ -4,7 +4,12 @@ Implements role-based access control (RBAC) for documents.
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Set
+import sys
+from collections import Counter, deque
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Optional, Set, Deque, FrozenSet, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass
 
@@ -20,6 +25,60 @@ class ClearanceLevel(Enum):
     TOP_SECRET = 5
 
 
+@lru_cache(maxsize=32)
+def _to_clearance(value: Union[str, int, ClearanceLevel]) -> int:
+    """Numeric clearance for a level name, number or ClearanceLevel."""
+    if isinstance(value, ClearanceLevel):
+        return value.value
+    if isinstance(value, str):
+        return ClearanceLevel[value.upper()].value
+    return ClearanceLevel(value).value
+
+
+@lru_cache(maxsize=1024)
+def _split_values(value: str) -> Tuple[str, ...]:
+    """Split a comma-joined role/department string as stored in metadata."""
+    return tuple(sys.intern(v) for v in value.split(",")) if value else ()
+
+
+class AuditLog(deque):
+    """
+    Bounded audit log with a per-user index.
+    
+    Behaves like ``deque(maxlen=...)`` for appending, reading and clearing,
+    and additionally keeps each user's entries in order so they can be
+    listed without scanning everyone else's. Only append() and clear()
+    update the index; use those to modify the log.
+    """
+    
+    def __init__(self, maxlen: Optional[int] = None):
+        super().__init__(maxlen=maxlen)
+        self._by_user: Dict[str, Deque[Dict]] = {}
+    
+    def append(self, entry: Dict):
+        # A full deque drops its oldest entry, which is also the oldest
+        # entry of that user
+        if self.maxlen is not None and len(self) == self.maxlen:
+            if self.maxlen == 0:
+                return
+            evicted = self[0]
+            user_entries = self._by_user[evicted["user_id"]]
+            user_entries.popleft()
+            if not user_entries:
+                del self._by_user[evicted["user_id"]]
+        
+        super().append(entry)
+        self._by_user.setdefault(entry["user_id"], deque()).append(entry)
+    
+    def clear(self):
+        super().clear()
+        self._by_user.clear()
+    
+    def for_user(self, user_id: str) -> Deque[Dict]:
+        """Entries of one user, oldest first (do not modify)."""
+        return self._by_user.get(user_id, deque())
+
+
 @dataclass
 class User:
     """User with access control attributes."""
@@ -36,9 +95,22 @@ class AccessController:
     Implements RBAC and attribute-based access control (ABAC).
     """
     
-    def __init__(self):
-        """Initialize access controller."""
-        self.audit_log = []
+    def __init__(
+        self,
+        max_audit_entries: int = 100_000,
+        log_per_document: bool = False
+    ):
+        """
+        Initialize access controller.
+        
+        Args:
+            max_audit_entries: Audit entries kept in memory; the oldest
+                are evicted once the log is full
+            log_per_document: Have filter_documents() write one audit entry
+                per document instead of one summary entry per call
+        """
+        self.audit_log = AuditLog(maxlen=max_audit_entries)
+        self.log_per_document = log_per_document
         logger.info("AccessController initialized")
     
     def can_access_document(
@@ -56,41 +128,20 @@ class AccessController:
         Returns:
             True if user has access, False otherwise
         """
-        # Check clearance level
-        doc_clearance = document_metadata.get("clearance_level")
-        if doc_clearance:
-            if isinstance(doc_clearance, str):
-                doc_clearance = ClearanceLevel[doc_clearance.upper()]
-            
-            if user.clearance_level.value < doc_clearance.value:
-                self._log_access_denied(
-                    user.user_id,
-                    document_metadata.get("document_id"),
-                    "insufficient_clearance"
-                )
-                return False
-        
-        # Check required roles
-        required_roles = document_metadata.get("required_roles", [])
-        if required_roles:
-            if not any(role in user.roles for role in required_roles):
-                self._log_access_denied(
-                    user.user_id,
-                    document_metadata.get("document_id"),
-                    "missing_role"
-                )
-                return False
+        reason = self._denial_reason(
+            document_metadata,
+            user.clearance_level.value,
+            frozenset(user.roles),
+            frozenset(user.departments)
+        )
         
-        # Check department restrictions
-        allowed_departments = document_metadata.get("allowed_departments", [])
-        if allowed_departments:
-            if not any(dept in user.departments for dept in allowed_departments):
-                self._log_access_denied(
-                    user.user_id,
-                    document_metadata.get("document_id"),
-                    "department_mismatch"
-                )
-                return False
+        if reason:
+            self._log_access_denied(
+                user.user_id,
+                document_metadata.get("document_id"),
+                reason
+            )
+            return False
         
         # Access granted
         self._log_access_granted(
@@ -100,6 +151,46 @@ class AccessController:
         
         return True
     
+    @staticmethod
+    def _denial_reason(
+        document_metadata: Dict[str, Any],
+        clearance: int,
+        roles: FrozenSet[str],
+        departments: FrozenSet[str]
+    ) -> Optional[str]:
+        """
+        Check a document against precomputed user attributes.
+        
+        Args:
+            document_metadata: Document metadata with access controls
+            clearance: User's numeric clearance level
+            roles: User's roles
+            departments: User's departments
+            
+        Returns:
+            Reason access is denied, or None if access is allowed
+        """
+        # Check clearance level
+        doc_clearance = document_metadata.get("clearance_level")
+        if doc_clearance and clearance < _to_clearance(doc_clearance):
+            return "insufficient_clearance"
+        
+        # Check required roles
+        required_roles = document_metadata.get("required_roles", [])
+        if isinstance(required_roles, str):
+            required_roles = _split_values(required_roles)
+        if required_roles and roles.isdisjoint(required_roles):
+            return "missing_role"
+        
+        # Check department restrictions
+        allowed_departments = document_metadata.get("allowed_departments", [])
+        if isinstance(allowed_departments, str):
+            allowed_departments = _split_values(allowed_departments)
+        if allowed_departments and departments.isdisjoint(allowed_departments):
+            return "department_mismatch"
+        
+        return None
+    
     def filter_documents(
         self,
         user: User,
@@ -117,9 +208,31 @@ class AccessController:
         """
         accessible_docs = []
         
-        for doc in documents:
-            if self.can_access_document(user, doc.get("metadata", {})):
-                accessible_docs.append(doc)
+        # User attributes are the same for every document; build them once
+        clearance = user.clearance_level.value
+        roles = frozenset(user.roles)
+        departments = frozenset(user.departments)
+        
+        if self.log_per_document:
+            for doc in documents:
+                metadata = doc.get("metadata", {})
+                reason = self._denial_reason(metadata, clearance, roles, departments)
+                if reason:
+                    self._log_access_denied(user.user_id, metadata.get("document_id"), reason)
+                else:
+                    self._log_access_granted(user.user_id, metadata.get("document_id"))
+                    accessible_docs.append(doc)
+        else:
+            reasons = Counter()
+            for doc in documents:
+                reason = self._denial_reason(
+                    doc.get("metadata", {}), clearance, roles, departments
+                )
+                if reason:
+                    reasons[reason] += 1
+                else:
+                    accessible_docs.append(doc)
+            self._log_filter(user.user_id, len(accessible_docs), reasons)
         
         logger.info(
             f"Filtered {len(documents)} documents to {len(accessible_docs)} "
@@ -132,21 +245,58 @@ class AccessController:
         """
         Get metadata filter for vector store queries.
         
+        The filter applies the same clearance, role and department rules
+        as ``can_access_document`` inside ChromaDB, so unauthorized chunks
+        are never retrieved. It expects chunks stored with
+        ``storage_metadata()``. A multi-valued role or department list
+        cannot be matched by a ChromaDB ``$in`` on a scalar, so such chunks
+        are excluded (fail closed); run ``filter_documents`` on the results
+        as the authoritative check.
+        
         Args:
             user: User object
             
         Returns:
-            Dictionary with metadata filters
+            ChromaDB ``where`` filter
         """
-        # This creates a filter that can be used directly with ChromaDB
-        # Note: Actual implementation depends on your metadata structure
         return {
-            "$or": [
-                {"clearance_level": {"$lte": user.clearance_level.name}},
-                {"clearance_level": None}
+            "$and": [
+                {"clearance_level_n": {"$lte": user.clearance_level.value}},
+                {"required_roles": {"$in": [*user.roles, ""]}},
+                {"allowed_departments": {"$in": [*user.departments, ""]}}
             ]
         }
     
+    @staticmethod
+    def storage_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalise a chunk's access-control metadata for the vector store.
+        
+        ChromaDB metadata values must be scalars and ``where`` filters
+        cannot match missing keys, so every chunk gets a numeric
+        ``clearance_level_n`` (0 when unrestricted) and comma-joined
+        ``required_roles`` / ``allowed_departments`` ('' when unrestricted).
+        
+        Args:
+            metadata: Chunk metadata
+            
+        Returns:
+            New metadata dictionary ready for storage
+        """
+        stored = dict(metadata)
+        
+        clearance = metadata.get("clearance_level")
+        if isinstance(clearance, ClearanceLevel):
+            stored["clearance_level"] = clearance.name
+        stored["clearance_level_n"] = _to_clearance(clearance) if clearance else 0
+        
+        # Interned: every chunk of a document carries the same values
+        for key in ("required_roles", "allowed_departments"):
+            values = metadata.get(key) or ""
+            stored[key] = sys.intern(values if isinstance(values, str) else ",".join(values))
+        
+        return stored
+    
     def _log_access_granted(self, user_id: str, document_id: Optional[str]):
         """Log successful access."""
         self.audit_log.append({
@@ -174,9 +324,24 @@ class AccessController:
             f"Access denied for user {user_id} to document {document_id}: {reason}"
         )
     
+    def _log_filter(self, user_id: str, granted: int, reasons: Counter):
+        """Log one summary entry for a filter_documents() call."""
+        denied = sum(reasons.values())
+        self.audit_log.append({
+            "event": "filter",
+            "user_id": user_id,
+            "granted": granted,
+            "denied": denied,
+            "reasons": dict(reasons),
+            "timestamp": self._get_timestamp()
+        })
+        if denied:
+            logger.warning(
+                f"Access denied for user {user_id} to {denied} documents: {dict(reasons)}"
+            )
+    
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
-        from datetime import datetime
         return datetime.utcnow().isoformat()
     
     def get_audit_log(
@@ -194,11 +359,12 @@ class AccessController:
         Returns:
             List of audit log entries
         """
+        # Walk back from the newest entry and stop after `limit` matches
         if user_id:
-            filtered_log = [
-                entry for entry in self.audit_log
-                if entry["user_id"] == user_id
-            ]
-            return filtered_log[-limit:]
+            entries = reversed(self.audit_log.for_user(user_id))
+        else:
+            entries = reversed(self.audit_log)
         
-        return self.audit_log[-limit:]
\ No newline at end of file
+        recent = list(islice(entries, max(limit, 0)))
+        recent.reverse()
+        return recent
\ No newline at end of file
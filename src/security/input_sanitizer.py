@@ -5,8 +5,12 @@ Removes PII, malicious content, and applies security filters.
 
 import logging
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+
+from src.security.patterns import compile_any
+from src.security.result_cache import ResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +22,8 @@ class SanitizationResult:
     removed_patterns: List[str]
     is_safe: bool
     warnings: List[str]
+    # PII kind -> number of matches replaced, for every enabled kind
+    counts: Dict[str, int] = field(default_factory=dict)
 
 
 class InputSanitizer:
@@ -47,6 +53,26 @@ class InputSanitizer:
         r'drop\s+table',  # SQL injection
     ]
     
+    # Compiled once at class creation; the string constants stay public
+    _EMAIL_RE = re.compile(EMAIL_PATTERN)
+    _PHONE_RE = re.compile(PHONE_PATTERN)
+    _SSN_RE = re.compile(SSN_PATTERN)
+    _CREDIT_CARD_RE = re.compile(CREDIT_CARD_PATTERN)
+    _IP_ADDRESS_RE = re.compile(IP_ADDRESS_PATTERN)
+    
+    # (pattern, placeholder, report name) in removal order
+    _PII_RULES = (
+        (_EMAIL_RE, "[EMAIL]", "emails"),
+        (_PHONE_RE, "[PHONE]", "phones"),
+        (_SSN_RE, "[SSN]", "ssn"),
+        (_CREDIT_CARD_RE, "[CREDIT_CARD]", "credit_cards"),
+        (_IP_ADDRESS_RE, "[IP_ADDRESS]", "ip_addresses")
+    )
+    _MALICIOUS_RES = [
+        (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in MALICIOUS_PATTERNS
+    ]
+    _MALICIOUS_ANY = compile_any(MALICIOUS_PATTERNS, re.IGNORECASE)
+    
     def __init__(
         self,
         remove_emails: bool = True,
@@ -54,7 +80,8 @@ class InputSanitizer:
         remove_ssn: bool = True,
         remove_credit_cards: bool = True,
         remove_ip_addresses: bool = False,
-        detect_malicious: bool = True
+        detect_malicious: bool = True,
+        cache_size: int = 4096
     ):
         """
         Initialize input sanitizer.
@@ -66,6 +93,8 @@ class InputSanitizer:
             remove_credit_cards: Remove credit card numbers
             remove_ip_addresses: Remove IP addresses
             detect_malicious: Detect malicious patterns
+            cache_size: Number of recent results kept for repeated inputs
+                (0 disables the cache)
         """
         self.remove_emails = remove_emails
         self.remove_phones = remove_phones
@@ -80,17 +109,15 @@ class InputSanitizer:
             r"(?i)(\bOR\b|\bAND\b)\s+['\"]?\w+['\"]?\s*=\s*['\"]?\w+['\"]?",
             r"['\"];?\s*(DROP|DELETE|INSERT)",
         ]
-
-
+        self._sql_any = compile_any(self.sql_patterns)
+        
+        self._cache = ResultCache(cache_size)
         
         logger.info("InputSanitizer initialized")
     
     def _detect_sql_injection(self, text: str) -> bool:
         """Detect SQL injection attempts."""
-        for pattern in self.sql_patterns:
-            if re.search(pattern, text):
-                return True
-        return False
+        return self._sql_any.search(text) is not None
     
     def sanitize(self, text: str) -> SanitizationResult:
         """
@@ -110,20 +137,39 @@ class InputSanitizer:
                 warnings=[]
             )
         
+        # The options are part of the key so changing them after
+        # construction never serves a stale result
+        key = (
+            self.remove_emails,
+            self.remove_phones,
+            self.remove_ssn,
+            self.remove_credit_cards,
+            self.remove_ip_addresses,
+            self.detect_malicious,
+            text
+        )
+        result = self._cache.get(key)
+        if result is None:
+            result = self._sanitize(text)
+            self._cache.put(key, result)
+        
+        # Fresh lists so callers cannot alter the cached result
+        return replace(
+            result,
+            removed_patterns=list(result.removed_patterns),
+            warnings=list(result.warnings),
+            counts=dict(result.counts)
+        )
+    
+    def _sanitize(self, text: str) -> SanitizationResult:
+        """Run the full set of checks on non-empty text."""
         sanitized = text
         removed_patterns = []
         warnings = []
         is_safe = True
         
-        # Check for malicious patterns first
-        if self.detect_malicious:
-            malicious_found = self._detect_malicious_patterns(sanitized.lower())
-            if malicious_found:
-                is_safe = False
-                warnings.append(f"Malicious patterns detected: {', '.join(malicious_found)}")
-                removed_patterns.extend(malicious_found)
-        
-        # SQL injection check
+        # SQL injection check first: it returns on its own, without the
+        # malicious-pattern findings
         if self._detect_sql_injection(text):
             return SanitizationResult(
                 sanitized_text=text,
@@ -132,43 +178,65 @@ class InputSanitizer:
                 warnings=["Potential SQL injection detected"]
             )
         
-        # Remove PII
-        if self.remove_emails:
-            sanitized, count = self._remove_pattern(sanitized, self.EMAIL_PATTERN, "[EMAIL]")
-            if count > 0:
-                removed_patterns.append(f"emails({count})")
-        
-        if self.remove_phones:
-            sanitized, count = self._remove_pattern(sanitized, self.PHONE_PATTERN, "[PHONE]")
-            if count > 0:
-                removed_patterns.append(f"phones({count})")
-        
-        if self.remove_ssn:
-            sanitized, count = self._remove_pattern(sanitized, self.SSN_PATTERN, "[SSN]")
-            if count > 0:
-                removed_patterns.append(f"ssn({count})")
-        
-        if self.remove_credit_cards:
-            sanitized, count = self._remove_pattern(sanitized, self.CREDIT_CARD_PATTERN, "[CREDIT_CARD]")
-            if count > 0:
-                removed_patterns.append(f"credit_cards({count})")
+        # Check for malicious patterns. Detection is audit-only: PII is
+        # still removed because callers use the sanitized text regardless
+        if self.detect_malicious:
+            malicious_found = self._detect_malicious_patterns(sanitized.lower())
+            if malicious_found:
+                is_safe = False
+                warnings.append(f"Malicious patterns detected: {', '.join(malicious_found)}")
+                removed_patterns.extend(malicious_found)
         
-        if self.remove_ip_addresses:
-            sanitized, count = self._remove_pattern(sanitized, self.IP_ADDRESS_PATTERN, "[IP_ADDRESS]")
-            if count > 0:
-                removed_patterns.append(f"ip_addresses({count})")
+        # Remove PII. One combined scan rules out the common PII-free
+        # case; otherwise the kinds are removed in turn, since replacing
+        # one kind changes what the next can match
+        enabled = (
+            self.remove_emails,
+            self.remove_phones,
+            self.remove_ssn,
+            self.remove_credit_cards,
+            self.remove_ip_addresses
+        )
+        counts = {
+            name: 0 for (_, _, name), enabled_kind in zip(self._PII_RULES, enabled) if enabled_kind
+        }
+        if counts and self._pii_regex(enabled).search(sanitized):
+            for (pattern, placeholder, name), enabled_kind in zip(self._PII_RULES, enabled):
+                if enabled_kind:
+                    sanitized, counts[name] = self._remove_pattern(sanitized, pattern, placeholder)
+            removed_patterns.extend(
+                f"{name}({count})" for name, count in counts.items() if count > 0
+            )
         
         return SanitizationResult(
             sanitized_text=sanitized.strip(),
             removed_patterns=removed_patterns,
             is_safe=is_safe,
-            warnings=warnings
+            warnings=warnings,
+            counts=counts
+        )
+    
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _pii_regex(cls, enabled: Tuple[bool, ...]) -> re.Pattern:
+        """
+        Alternation of the enabled PII patterns.
+        
+        Args:
+            enabled: Per-kind switches (emails, phones, SSNs, credit cards,
+                IP addresses)
+            
+        Returns:
+            Compiled regex matching wherever any enabled pattern does
+        """
+        return compile_any(
+            rule[0].pattern for rule, on in zip(cls._PII_RULES, enabled) if on
         )
     
     def _remove_pattern(
         self,
         text: str,
-        pattern: str,
+        pattern: re.Pattern,
         replacement: str
     ) -> Tuple[str, int]:
         """
@@ -176,15 +244,13 @@ class InputSanitizer:
         
         Args:
             text: Input text
-            pattern: Regex pattern
+            pattern: Compiled regex pattern
             replacement: Replacement string
             
         Returns:
             Tuple of (sanitized_text, count_removed)
         """
-        matches = re.findall(pattern, text)
-        sanitized = re.sub(pattern, replacement, text)
-        return sanitized, len(matches)
+        return pattern.subn(replacement, text)
     
     def _detect_malicious_patterns(self, text: str) -> List[str]:
         """
@@ -196,10 +262,15 @@ class InputSanitizer:
         Returns:
             List of detected pattern descriptions
         """
+        # One pass settles the common clean case; only a hit needs the
+        # per-pattern loop to name every pattern that matched
+        if not self._MALICIOUS_ANY.search(text):
+            return []
+        
         detected = []
         
-        for pattern in self.MALICIOUS_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern, compiled in self._MALICIOUS_RES:
+            if compiled.search(text):
                 detected.append(pattern)
         
         return detected
@@ -0,0 +1,35 @@
+"""
+Regex helpers shared by the security filters.
+"""
+
+import re
+from typing import Iterable
+
+# A global inline flag group at the start of a pattern, e.g. "(?i)"
+_GLOBAL_FLAGS = re.compile(r'\(\?([aiLmsux]+)\)')
+
+
+def compile_any(patterns: Iterable[str], flags: int = 0) -> re.Pattern:
+    """
+    Compile patterns into one alternation that matches wherever any does.
+
+    ``compile_any(ps).search(text)`` finds a match exactly when some
+    ``re.search(p, text)`` would, but scans the text once instead of once
+    per pattern. A leading global flag such as ``(?i)`` is rewritten as a
+    scoped group, since Python only accepts global flags at the very start
+    of a regex.
+
+    Args:
+        patterns: Regex pattern strings
+        flags: Flags applied to every pattern
+
+    Returns:
+        Compiled alternation
+    """
+    parts = []
+    for pattern in patterns:
+        match = _GLOBAL_FLAGS.match(pattern)
+        if match:
+            pattern = f"(?{match.group(1)}:{pattern[match.end():]})"
+        parts.append(f"(?:{pattern})")
+    return re.compile("|".join(parts), flags)
@@ -6,6 +6,14 @@ import logging
 import re
 from typing import List, Tuple, Optional
 
+from src.security.patterns import compile_any
+from src.security.result_cache import ResultCache
+
+try:
+    import ahocorasick  # C automaton for the literal phrase list
+except ImportError:  # pragma: no cover
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,12 +68,25 @@ class PromptGuard:
         'developer mode', 'debug mode', 'jailbreak'
     ]
     
+    # Compiled once at class creation. analyze_query() matches the raw
+    # query case-sensitively; the detection helpers ignore case.
+    _INJECTION_RES = [re.compile(pattern) for pattern in INJECTION_PATTERNS]
+    _INJECTION_RES_I = [
+        (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in INJECTION_PATTERNS
+    ]
+    _PHRASES_LOWER = [phrase.lower() for phrase in SUSPICIOUS_PHRASES]
+    
+    # Single-pass "does anything match?" checks over the same patterns
+    _INJECTION_ANY = compile_any(INJECTION_PATTERNS)
+    _INJECTION_ANY_I = compile_any(INJECTION_PATTERNS, re.IGNORECASE)
+    
     def __init__(
         self,
         max_query_length: int = 1000,
         enable_pattern_detection: bool = True,
         enable_phrase_detection: bool = True,
-        strictness: str = "medium"  # low, medium, high
+        strictness: str = "medium",  # low, medium, high
+        cache_size: int = 4096
     ):
         """
         Initialize prompt guard.
@@ -75,6 +96,8 @@ class PromptGuard:
             enable_pattern_detection: Enable regex pattern detection
             enable_phrase_detection: Enable suspicious phrase detection
             strictness: Detection strictness level
+            cache_size: Number of recent verdicts and analyses kept for
+                repeated queries (0 disables the caches)
         """
         self.max_query_length = max_query_length
         self.enable_pattern_detection = enable_pattern_detection
@@ -89,14 +112,24 @@ class PromptGuard:
             r"(?i)print\s+(your\s+)?(entire\s+)?knowledge\s+base",
             r"(?i)dump\s+(all\s+)?(your\s+)?data",
             r'show\s+(me\s+)?(all|your)?\s*(data|training|documents)',
-            r'reveal\s+(your|the)?\s*(prompt|instructions|data)',  # Make (your|the) optional with ?
             r'what\s+(are|is)\s+your\s+(instructions|prompt|training)',
             r'(print|display|output)\s+(your|the)?\s*(system|prompt)',
-            r'reveal.*data',
-            r'reveal.*prompt',
-            r'reveal.*instructions',
+            # "reveal" followed by a target, on one line or across a line break
+            r'reveal(\s+(your|the)?\s*|.*)(prompt|instructions|data)',
             r'ignore.*instructions',
         ]
+        self._data_extraction_res = [
+            (pattern, re.compile(pattern)) for pattern in self.data_extraction_patterns
+        ]
+        self._data_extraction_any = compile_any(self.data_extraction_patterns)
+        
+        # All suspicious phrases found in one pass over the query
+        self._phrase_automaton = None
+        if ahocorasick is not None:
+            self._phrase_automaton = ahocorasick.Automaton()
+            for index, phrase in enumerate(self._PHRASES_LOWER):
+                self._phrase_automaton.add_word(phrase, index)
+            self._phrase_automaton.make_automaton()
         
         # Set thresholds based on strictness
         if strictness == "low":
@@ -106,6 +139,9 @@ class PromptGuard:
         else:  # high
             self.phrase_threshold = 1
         
+        self._verdict_cache = ResultCache(cache_size)
+        self._analysis_cache = ResultCache(cache_size)
+        
         logger.info(f"PromptGuard initialized with strictness: {strictness}")
     
     def is_safe_query(self, query: str) -> bool:
@@ -121,41 +157,82 @@ class PromptGuard:
         if not query:
             return True
         
+        key = self._cache_key(query)
+        verdict = self._verdict_cache.get(key)
+        if verdict is None:
+            verdict = self._is_safe_query(query)
+            self._verdict_cache.put(key, verdict)
+        elif not verdict:
+            logger.warning("Query previously rejected")
+        
+        return verdict
+    
+    def _is_safe_query(self, query: str) -> bool:
+        """Run the full set of checks on a non-empty query."""
         # Check length
         if len(query) > self.max_query_length:
             logger.warning(f"Query exceeds max length: {len(query)} > {self.max_query_length}")
             return False
         
-        # Check for injection patterns
-        if self.enable_pattern_detection:
-            if self._detect_injection_patterns(query):
-                logger.warning("Injection pattern detected in query")
-                return False
+        # Lowercased once and shared by the case-insensitive checks
+        query_lower = query.lower()
         
-        # Check for data extraction
-        for pattern in self.data_extraction_patterns:
-            if re.search(pattern, query):
-                return False
+        # Checks run cheapest first: each one alone decides the verdict,
+        # so order only affects how soon an unsafe query is rejected
         
         # Check for suspicious phrases
         if self.enable_phrase_detection:
-            suspicious_count = self._count_suspicious_phrases(query)
+            suspicious_count = self._count_suspicious_phrases(
+                query, limit=self.phrase_threshold, query_lower=query_lower
+            )
             if suspicious_count >= self.phrase_threshold:
-                logger.warning(f"Too many suspicious phrases: {suspicious_count}")
+                logger.warning(f"Too many suspicious phrases: at least {suspicious_count}")
+                return False
+        
+        # Check for data extraction
+        if self._data_extraction_any.search(query):
+            return False
+        
+        # Check for injection patterns
+        if self.enable_pattern_detection:
+            if self._detect_injection_patterns(query, query_lower):
+                logger.warning("Injection pattern detected in query")
                 return False
         
         return True
     
-    def analyze_query(self, query: str) -> dict:
+    def analyze_query(self, query: str, exhaustive: bool = True) -> dict:
         """
         Detailed analysis of query safety.
         
         Args:
             query: User query string
+            exhaustive: Collect every violation. When False, analysis stops
+                once the risk score reaches its 1.0 cap, since the verdict
+                can no longer change; the violation and phrase lists may
+                then be partial.
             
         Returns:
             Dictionary with analysis results
         """
+        key = (exhaustive, self._cache_key(query))
+        analysis = self._analysis_cache.get(key)
+        if analysis is None:
+            analysis = self._analyze_query(query, exhaustive)
+            self._analysis_cache.put(key, analysis)
+        
+        # Fresh lists so callers cannot alter the cached analysis
+        return {
+            **analysis,
+            "violations": list(analysis["violations"]),
+            "suspicious_phrases": list(analysis["suspicious_phrases"])
+        }
+    
+    def _analyze_query(self, query: str, exhaustive: bool) -> dict:
+        """Build the analysis dictionary for analyze_query()."""
+        # Score at which a non-exhaustive analysis stops
+        saturation = float("inf") if exhaustive else 1.0
+        
         analysis = {
             "query": query,
             "is_safe": True,
@@ -165,34 +242,43 @@ class PromptGuard:
             "risk_score": 0.0
         }
         
+        query_lower = query.lower()
+        
         # Length check
         if len(query) > self.max_query_length:
             analysis["is_safe"] = False
             analysis["violations"].append("excessive_length")
             analysis["risk_score"] += 0.5
         
-        # Check all patterns
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, query):
-                analysis["violations"].append(f"Injection pattern detected: {pattern}")
-                analysis["risk_score"] += 0.3
+        # Check all patterns (one combined scan first; the per-pattern
+        # loop only runs to name the matches)
+        if self._INJECTION_ANY.search(query):
+            for pattern, compiled in zip(self.INJECTION_PATTERNS, self._INJECTION_RES):
+                if analysis["risk_score"] >= saturation:
+                    break
+                if compiled.search(query):
+                    analysis["violations"].append(f"Injection pattern detected: {pattern}")
+                    analysis["risk_score"] += 0.3
         
-        for pattern in self.data_extraction_patterns:
-            if re.search(pattern, query):
-                analysis["violations"].append(f"Data extraction attempt: {pattern}")
-                analysis["risk_score"] += 0.4
+        if self._data_extraction_any.search(query):
+            for pattern, compiled in self._data_extraction_res:
+                if analysis["risk_score"] >= saturation:
+                    break
+                if compiled.search(query):
+                    analysis["violations"].append(f"Data extraction attempt: {pattern}")
+                    analysis["risk_score"] += 0.4
         
         # Pattern detection
-        if self.enable_pattern_detection:
-            detected_patterns = self._get_detected_patterns(query)
+        if self.enable_pattern_detection and analysis["risk_score"] < saturation:
+            detected_patterns = self._get_detected_patterns(query, query_lower)
             if detected_patterns:
                 analysis["is_safe"] = False
                 analysis["violations"].extend(detected_patterns)
                 analysis["risk_score"] += 0.5 * len(detected_patterns)
         
         # Phrase detection
-        if self.enable_phrase_detection:
-            suspicious_phrases = self._get_suspicious_phrases(query)
+        if self.enable_phrase_detection and analysis["risk_score"] < saturation:
+            suspicious_phrases = self._get_suspicious_phrases(query, query_lower)
             analysis["suspicious_phrases"] = suspicious_phrases
             
             if len(suspicious_phrases) >= self.phrase_threshold:
@@ -209,45 +295,68 @@ class PromptGuard:
         
         return analysis
     
-    def _detect_injection_patterns(self, query: str) -> bool:
+    def _cache_key(self, query: str) -> tuple:
+        """Cache key covering the query and every setting that affects the result."""
+        return (
+            self.max_query_length,
+            self.enable_pattern_detection,
+            self.enable_phrase_detection,
+            self.phrase_threshold,
+            query
+        )
+    
+    def _detect_injection_patterns(self, query: str, query_lower: Optional[str] = None) -> bool:
         """Check if any injection patterns match."""
-        query_lower = query.lower()
-        
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, query_lower, re.IGNORECASE):
-                return True
-        
-        return False
+        if query_lower is None:
+            query_lower = query.lower()
+        return self._INJECTION_ANY_I.search(query_lower) is not None
     
-    def _get_detected_patterns(self, query: str) -> List[str]:
+    def _get_detected_patterns(self, query: str, query_lower: Optional[str] = None) -> List[str]:
         """Get list of detected injection patterns."""
-        query_lower = query.lower()
+        if query_lower is None:
+            query_lower = query.lower()
+        if not self._INJECTION_ANY_I.search(query_lower):
+            return []
+        
         detected = []
         
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, query_lower, re.IGNORECASE):
+        for pattern, compiled in self._INJECTION_RES_I:
+            if compiled.search(query_lower):
                 detected.append(pattern[:50])  # Truncate for readability
         
         return detected
     
-    def _count_suspicious_phrases(self, query: str) -> int:
-        """Count number of suspicious phrases in query."""
-        query_lower = query.lower()
-        count = 0
-        
-        for phrase in self.SUSPICIOUS_PHRASES:
-            if phrase.lower() in query_lower:
-                count += 1
-        
-        return count
+    def _count_suspicious_phrases(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        query_lower: Optional[str] = None
+    ) -> int:
+        """Count number of suspicious phrases in query, stopping at limit."""
+        if query_lower is None:
+            query_lower = query.lower()
+        return len(self._find_suspicious_phrases(query_lower, limit))
     
-    def _get_suspicious_phrases(self, query: str) -> List[str]:
+    def _get_suspicious_phrases(self, query: str, query_lower: Optional[str] = None) -> List[str]:
         """Get list of suspicious phrases found in query."""
-        query_lower = query.lower()
-        found = []
-        
-        for phrase in self.SUSPICIOUS_PHRASES:
-            if phrase.lower() in query_lower:
-                found.append(phrase)
+        if query_lower is None:
+            query_lower = query.lower()
+        return [self.SUSPICIOUS_PHRASES[i] for i in self._find_suspicious_phrases(query_lower)]
+    
+    def _find_suspicious_phrases(self, query_lower: str, limit: Optional[int] = None) -> List[int]:
+        """Indices of distinct suspicious phrases in a lowercased query, in list order."""
+        if self._phrase_automaton is None:
+            found = []
+            for index, phrase in enumerate(self._PHRASES_LOWER):
+                if phrase in query_lower:
+                    found.append(index)
+                    if limit is not None and len(found) >= limit:
+                        break
+            return found
         
-        return found
\ No newline at end of file
+        found = set()
+        for _, index in self._phrase_automaton.iter(query_lower):
+            found.add(index)
+            if limit is not None and len(found) >= limit:
+                break
+        return sorted(found)
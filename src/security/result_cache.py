@@ -0,0 +1,77 @@
+"""
+Bounded LRU cache for security check results.
+Repeated queries (retries, common questions) skip the regex battery.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class ResultCache:
+    """
+    Thread-safe least-recently-used cache.
+
+    The API runs security checks in worker threads, so every access is
+    guarded by a lock. A ``max_entries`` of 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize result cache.
+
+        Args:
+            max_entries: Maximum number of cached results (0 disables)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        if self.max_entries <= 0:
+            return None
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a result, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Result to cache (must not be None)
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
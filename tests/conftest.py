@@ -0,0 +1,65 @@
+"""
+conftest.py
+===========
+Fixtures shared across the test modules.
+"""
+
+from __future__ import annotations
+
+import sys
+import os
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+
+# ---------------------------------------------------------------------------
+# Path bootstrap
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+# ===========================================================================
+# FaithfulnessScorer
+# ===========================================================================
+
+
+@pytest.fixture(scope="session")
+def _session_scorer():
+    """Session-scoped — the embedding model loads once for the whole run."""
+    from evaluation.faithfulness import FaithfulnessScorer
+    return FaithfulnessScorer()
+
+
+@pytest.fixture
+def scorer(_session_scorer):
+    """The shared scorer with empty caches, so cache assertions do not
+    depend on which tests ran before."""
+    _session_scorer.clear_caches()
+    return _session_scorer
+
+
+# ===========================================================================
+# FastAPI app
+# ===========================================================================
+
+
+@pytest.fixture(scope="session")
+def api_app():
+    """
+    The FastAPI app, imported once per test process.
+
+    ChromaDB and sentence-transformers are mocked only while ``api.main``
+    is imported, so other test modules keep the real packages and the
+    import no longer depends on collection order.  ``chromadb`` is mocked
+    as a package so ``from chromadb.config import Settings`` resolves.
+    """
+    mock_chroma = MagicMock()
+    mock_chroma.__path__ = []
+    mock_chroma.HttpClient = Mock(return_value=Mock())
+
+    with patch.dict(sys.modules, {
+        "chromadb":              mock_chroma,
+        "chromadb.config":       mock_chroma.config,
+        "sentence_transformers": MagicMock(),
+    }):
+        from api.main import app
+    return app
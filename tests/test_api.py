@@ -18,25 +18,19 @@ from __future__ import annotations
 
 import sys
 import os
+from typing import Optional
+from unittest.mock import Mock
+
 import pytest
 from fastapi.testclient import TestClient
 
 # Path bootstrap
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-# Mock the heavy imports before they're loaded by main.py
-from unittest.mock import Mock, MagicMock, patch
-
-# ---- Mock ChromaDB and sentence-transformers BEFORE importing main.py ----
-mock_chroma = MagicMock()
-mock_chroma.HttpClient = Mock(return_value=Mock())
-sys.modules["chromadb"] = mock_chroma
-
-mock_sentence_transformers = MagicMock()
-sys.modules["sentence_transformers"] = mock_sentence_transformers
-
-# Now safe to import
-from api.main import app
+# ChromaDB and sentence-transformers are mocked by the ``api_app`` fixture
+# in conftest.py, which imports main.py
+import numpy as np
+from api.query_cache import QueryCache
 from generation.rag_pipeline import RAGResponse, RetrievedChunk
 
 
@@ -46,15 +40,45 @@ from generation.rag_pipeline import RAGResponse, RetrievedChunk
 
 
 @pytest.fixture
-def client():
-    """FastAPI test client."""
-    return TestClient(app)
+def client(api_app, monkeypatch):
+    """
+    FastAPI test client with the services ``lifespan`` would create
+    replaced by light stand-ins, so endpoints run without a model or
+    ChromaDB server.
+    """
+    from api import main
+    from generation.rag_pipeline import RAGPipeline
+    from security.input_sanitizer import InputSanitizer
+    from security.prompt_guard import PromptGuard
+
+    collection = Mock()
+    collection.count.return_value = 1
+    monkeypatch.setattr(main, "vector_store", Mock(collection=collection))
+    monkeypatch.setattr(main, "input_sanitizer", InputSanitizer())
+    monkeypatch.setattr(main, "prompt_guard", PromptGuard())
+    monkeypatch.setattr(main, "faithfulness_scorer", None)
+    monkeypatch.setattr(main, "rag_pipeline", RAGPipeline(
+        llm_fn              =lambda system, user: "",
+        vector_store        =collection,
+        audit_log_path      =None,
+        faithfulness_scorer =Mock(model_loaded=True),
+    ))
+    monkeypatch.setitem(main._health_cache, "ts", float("-inf"))
+    main.query_cache.clear()
+    return TestClient(api_app)
 
 
 @pytest.fixture
 def mock_rag_pipeline(monkeypatch):
-    """Mock the RAG pipeline to return a canned response."""
-    def mock_run(self, query: str) -> RAGResponse:
+    """
+    Mock the RAG pipeline to return a canned response.
+
+    Returns the list of ``(query, where)`` pairs the pipeline was run with.
+    """
+    calls = []
+
+    def mock_run(self, query: str, where: Optional[dict] = None) -> RAGResponse:
+        calls.append((query, where))
         return RAGResponse(
             request_id="test-request-id",
             query=query,
@@ -78,6 +102,7 @@ def mock_rag_pipeline(monkeypatch):
 
     from generation import rag_pipeline
     monkeypatch.setattr(rag_pipeline.RAGPipeline, "run", mock_run)
+    return calls
 
 
 # ===========================================================================
@@ -203,6 +228,57 @@ class TestQueryEndpoint:
         )
         assert response.status_code == 200
 
+    def test_query_passes_access_filter(self, client, mock_rag_pipeline):
+        """Retrieval is restricted to the caller's clearance level."""
+        client.post("/query", json={"query": "Test", "clearance_level": "internal"})
+        (_, where), = mock_rag_pipeline
+        assert {"clearance_level_n": {"$lte": 2}} in where["$and"]
+
+    def test_query_rejects_unknown_fields(self, client, mock_rag_pipeline):
+        response = client.post("/query", json={"query": "Test", "role": "admin"})
+        assert response.status_code == 422
+        assert mock_rag_pipeline == []
+
+    def test_query_returns_json(self, client, mock_rag_pipeline):
+        """The orjson-rendered body is plain JSON with the pipeline's values."""
+        response = client.post("/query", json={"query": "Test"})
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["faithfulness_score"] == 0.92
+
+
+class TestQueryCacheHit:
+
+    def test_repeat_query_served_from_cache_and_audited(
+        self, client, mock_rag_pipeline, monkeypatch, tmp_path,
+    ):
+        """A cache hit skips the pipeline but still leaves an audit record."""
+        import json
+        from api import main
+
+        audit_path = tmp_path / "audit.jsonl"
+        monkeypatch.setattr(main.rag_pipeline, "audit_log_path", str(audit_path))
+
+        first  = client.post("/query", json={"query": "What is Python?"})
+        second = client.post("/query", json={"query": "What is Python?"})
+        main.rag_pipeline.close()
+
+        assert len(mock_rag_pipeline) == 1
+        assert first.json()["metadata"].get("cached") is None
+        data = second.json()
+        assert data["metadata"]["cached"] is True
+        assert data["answer"] == first.json()["answer"]
+
+        (record,) = [json.loads(line) for line in audit_path.read_text().splitlines()]
+        assert record["request_id"] == data["request_id"] == second.headers["x-request-id"]
+        assert record["cache_tier"] == "exact"
+        assert record["cached_request_id"] == "test-request-id"
+        assert record["audit_log"][0]["stage"] == "CACHE_HIT"
+
+    def test_cache_scope_isolates_clearance(self, client, mock_rag_pipeline):
+        client.post("/query", json={"query": "q", "clearance_level": "secret"})
+        client.post("/query", json={"query": "q", "clearance_level": "public"})
+        assert len(mock_rag_pipeline) == 2
+
 
 class TestRootEndpoint:
 
@@ -230,4 +306,101 @@ class TestRequestID:
         """Each request should get a unique request ID."""
         r1 = client.get("/health")
         r2 = client.get("/health")
-        assert r1.headers["x-request-id"] != r2.headers["x-request-id"]
\ No newline at end of file
+        assert r1.headers["x-request-id"] != r2.headers["x-request-id"]
+
+
+class TestAccessScope:
+
+    def test_clearance_maps_to_where_filter(self, api_app):
+        """The caller's clearance level bounds what retrieval may return."""
+        from api import main
+        from api.models import QueryRequest
+
+        user  = main._resolve_user(QueryRequest(query="q", clearance_level="confidential"))
+        where = main.access_controller.get_filter_metadata(user)
+        assert {"clearance_level_n": {"$lte": 3}} in where["$and"]
+
+    def test_cache_scope_covers_user_and_top_k(self, api_app):
+        """Cached answers are not shared across users, levels or top_k."""
+        from api import main
+        from api.models import QueryRequest
+
+        def scope(**kw):
+            body = QueryRequest(query="q", **kw)
+            return main._cache_scope(main._resolve_user(body), body)
+
+        base = scope(user_id="alice", top_k=10)
+        assert base != scope(user_id="alice", top_k=1)
+        assert base != scope(user_id="bob", top_k=10)
+        assert base != scope(user_id="alice", top_k=10, clearance_level="secret")
+        assert base == scope(user_id="alice", top_k=10, clearance_level="PUBLIC")
+
+    def test_unknown_clearance_rejected(self, api_app):
+        from fastapi import HTTPException
+        from api import main
+        from api.models import QueryRequest
+
+        with pytest.raises(HTTPException) as exc:
+            main._resolve_user(QueryRequest(query="q", clearance_level="restricted"))
+        assert exc.value.status_code == 400
+
+
+class TestBlasThreads:
+
+    def test_malformed_env_falls_back(self, api_app, monkeypatch):
+        """Bad thread-count settings never stop the app from importing."""
+        from api import main
+
+        for value in ("abc", "0", "-2", ""):
+            monkeypatch.setenv("WEB_CONCURRENCY", value)
+            assert main._env_positive_int("WEB_CONCURRENCY", 2) == 2
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        assert main._env_positive_int("WEB_CONCURRENCY", 2) == 4
+
+
+class TestQueryCache:
+
+    def test_exact_hit(self):
+        cache = QueryCache(max_entries=4)
+        cache.put("public", "What is Python?", None, "answer")
+        assert cache.get_exact("public", "What is Python?") == "answer"
+
+    def test_semantic_hit_above_threshold(self):
+        cache = QueryCache(max_entries=4, similarity_threshold=0.95)
+        emb = np.array([1.0, 0.0], dtype=np.float32)
+        cache.put("public", "What is Python?", emb, "answer")
+        near = np.array([0.99, 0.141], dtype=np.float32)
+        far  = np.array([0.0, 1.0], dtype=np.float32)
+        assert cache.get_similar("public", near) == "answer"
+        assert cache.get_similar("public", far) is None
+
+    def test_scopes_are_isolated(self):
+        """An answer cached for one clearance level is never served to another."""
+        cache = QueryCache(max_entries=4)
+        emb = np.array([1.0, 0.0], dtype=np.float32)
+        cache.put("confidential", "q", emb, "secret answer")
+        assert cache.get_exact("public", "q") is None
+        assert cache.get_similar("public", emb) is None
+
+    def test_semantic_rows_reused_after_eviction(self):
+        """Embedding rows grow past the initial capacity and are recycled."""
+        cache = QueryCache(max_entries=20, similarity_threshold=0.99)
+        basis = np.eye(32, dtype=np.float32)
+        for i in range(32):
+            cache.put("public", f"q{i}", basis[i], f"a{i}")
+
+        assert cache.get_similar("public", basis[0]) is None      # evicted
+        assert cache.get_similar("public", basis[31]) == "a31"
+        assert cache.get_similar("public", basis[12]) == "a12"
+        assert len(cache._keys) <= 21
+
+        cache.put("public", "q31", None, "replaced")               # row freed
+        assert cache.get_similar("public", basis[31]) is None
+        assert cache.get_exact("public", "q31") == "replaced"
+
+    def test_oldest_entry_evicted(self):
+        cache = QueryCache(max_entries=2)
+        for q in ("a", "b", "c"):
+            cache.put("public", q, None, q)
+        assert cache.get_exact("public", "a") is None
+        assert cache.get_exact("public", "c") == "c"
@@ -0,0 +1,180 @@
+"""
+Tests for document loading.
+"""
+
+import pytest
+
+pytest.importorskip("markdown_it")
+
+from src.ingestion.document_processor import DocumentProcessor
+
+
+
+class _UpperProcessor(DocumentProcessor):
+    """Processor whose .rst loader is only registered on the subclass."""
+
+
+_UpperProcessor.register_loader(".rst", lambda self, path: [path.read_text().upper()])
+
+
+class TestIterChunks:
+    """Test streaming chunk generation over many files."""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"doc{i}.rst"
+            path.write_text(f"document {i} " + "lorem ipsum dolor sit amet " * 10)
+            paths.append(str(path))
+        return paths
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_subclass_loader_used_in_order(self, files, workers):
+        """Test subclass loaders apply in workers and file order is kept."""
+        chunks = list(_UpperProcessor(min_chunk_size=10).iter_chunks(files, max_workers=workers))
+
+        assert [c.content.split()[:2] for c in chunks] == [
+            ["DOCUMENT", str(i)] for i in range(5)
+        ]
+
+    def test_in_process_errors_skip_file(self, files, tmp_path):
+        """Test a failing file is logged and the rest are still chunked."""
+        missing = str(tmp_path / "missing.rst")
+        processor = _UpperProcessor(min_chunk_size=10)
+
+        chunks = list(processor.iter_chunks([files[0], missing, files[1]], max_workers=1))
+
+        assert len(chunks) == 2
+
+
+class TestMarkdownLoading:
+    """Test Markdown text extraction."""
+
+    @pytest.fixture
+    def processor(self):
+        """Create processor instance."""
+        return DocumentProcessor()
+
+    def test_inline_html_tags_stripped(self, processor, tmp_path):
+        """Test inline HTML keeps its text but not its markup."""
+        path = tmp_path / "inline.md"
+        path.write_text('Some <span class="x">styled</span> text &amp; more.\n')
+
+        text = processor._load_markdown(path)
+
+        assert text == "Some styled text & more."
+
+    def test_html_block_text_kept(self, processor, tmp_path):
+        """Test the text inside raw HTML blocks is kept."""
+        path = tmp_path / "block.md"
+        path.write_text('# Title\n\n<div class="note">\n<p>Block &amp; text</p>\n</div>\n\nEnd.\n')
+
+        text = processor._load_markdown(path)
+
+        assert "Block & text" in text
+        assert "<" not in text
+        assert text.startswith("Title") and text.endswith("End.")
+
+
+class TestExtractionCache:
+    """Test the extracted-text cache."""
+
+    def test_cache_dir_owner_only(self, tmp_path):
+        """Test the cache directory is not readable by other users."""
+        from src.ingestion.extraction_cache import ExtractionCache
+
+        cache = ExtractionCache(str(tmp_path / "extract"))
+
+        assert (tmp_path / "extract").stat().st_mode & 0o077 == 0
+        assert cache.cache_dir.stat().st_mode & 0o077 == 0
+
+    def test_key_depends_on_extractor(self, tmp_path):
+        """Test switching extraction backend does not reuse cached text."""
+        from src.ingestion.extraction_cache import ExtractionCache
+
+        cache = ExtractionCache(str(tmp_path / "extract"))
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"%PDF-1.4 test")
+
+        assert cache.key(path, "pymupdf") == cache.key(path, "pymupdf")
+        assert cache.key(path, "pymupdf") != cache.key(path, "pypdf")
+
+
+class TestAccessMetadataBackfill:
+    """Test upgrading chunks stored without access-control filter keys."""
+
+    class FakeCollection:
+        def __init__(self, metadatas):
+            self.ids = [f"c{i}" for i in range(len(metadatas))]
+            self.metadatas = metadatas
+            self.updates = []
+
+        def get(self, include, limit, offset):
+            return {
+                "ids": self.ids[offset:offset + limit],
+                "metadatas": self.metadatas[offset:offset + limit],
+            }
+
+        def update(self, ids, metadatas):
+            self.updates.append(ids)
+            for chunk_id, metadata in zip(ids, metadatas):
+                self.metadatas[self.ids.index(chunk_id)] = metadata
+
+    def test_backfill_adds_filter_keys(self):
+        """Test legacy chunks gain filter keys and current ones are left alone."""
+        ingest_docs = pytest.importorskip("src.ingestion.ingest_docs")
+        from types import SimpleNamespace
+
+        collection = self.FakeCollection([
+            {"document_id": "d1"},
+            {"document_id": "d2", "clearance_level": "confidential", "required_roles": "hr"},
+            {"document_id": "d3", "clearance_level": "restricted"},
+            {"document_id": "d4", "clearance_level_n": 0, "required_roles": "", "allowed_departments": ""},
+        ])
+        ingestor = ingest_docs.DocumentIngestor.__new__(ingest_docs.DocumentIngestor)
+        ingestor.vector_store = SimpleNamespace(collection=collection)
+
+        assert ingestor.backfill_access_metadata(batch_size=2) == 3
+        assert collection.metadatas[0]["clearance_level_n"] == 0
+        assert collection.metadatas[1]["clearance_level_n"] == 3
+        assert collection.metadatas[1]["required_roles"] == "hr"
+        assert collection.metadatas[2]["clearance_level_n"] == 5
+        assert all(m["allowed_departments"] == "" for m in collection.metadatas)
+        assert ingestor.backfill_access_metadata() == 0
+
+
+class TestLegacyIds:
+    """Test cleanup of chunks stored under pre-BLAKE2b IDs."""
+
+    def test_legacy_document_id_matches_md5_scheme(self, tmp_path):
+        """Test the legacy ID is the old MD5-derived, same-length ID."""
+        import hashlib
+
+        path = tmp_path / "doc.txt"
+        expected = hashlib.md5(str(path.absolute()).encode()).hexdigest()[:12]
+
+        legacy = DocumentProcessor.legacy_document_id(str(path))
+
+        assert legacy == f"doc_{expected}"
+        assert legacy != DocumentProcessor()._generate_document_id(path)
+        assert len(legacy) == len(DocumentProcessor()._generate_document_id(path))
+
+    def test_ingest_deletes_legacy_copies(self, tmp_path):
+        """Test re-ingesting a file removes its chunks stored under the old ID."""
+        ingest_docs = pytest.importorskip("src.ingestion.ingest_docs")
+        from unittest.mock import Mock
+
+        path = tmp_path / "doc.txt"
+        path.write_text("Some text long enough to make a chunk. " * 5)
+        ingestor = ingest_docs.DocumentIngestor.__new__(ingest_docs.DocumentIngestor)
+        ingestor.processor = DocumentProcessor(min_chunk_size=10)
+        ingestor.max_workers = 1
+        ingestor.ingest_batch_size = 8
+        ingestor.vector_store = Mock()
+        ingestor.vector_store.add_documents.side_effect = len
+
+        assert ingestor.ingest_files([str(path)]) > 0
+        ingestor.vector_store.delete_by_document_ids.assert_called_once_with(
+            [DocumentProcessor.legacy_document_id(str(path))]
+        )
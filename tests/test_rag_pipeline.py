@@ -18,6 +18,8 @@ from __future__ import annotations
 
 import sys
 import os
+import asyncio
+import numpy as np
 import pytest
 
 # ---------------------------------------------------------------------------
@@ -78,10 +80,7 @@ FABRICATED_RESPONSE = (
 # ===========================================================================
 
 
-@pytest.fixture(scope="module")
-def scorer() -> FaithfulnessScorer:
-    """Module-scoped — model loads once for all tests in this class."""
-    return FaithfulnessScorer()
+# The session-scoped ``scorer`` fixture lives in conftest.py.
 
 
 class TestFaithfulnessScorer:
@@ -109,6 +108,23 @@ class TestFaithfulnessScorer:
         # 9999 and 777 are not in context → numeric signal penalised
         assert score < 0.90
 
+    def test_numeric_consistency_checks_non_ascii_digits(self, scorer: FaithfulnessScorer):
+        """Numbers written in other digit scripts are checked too."""
+        detail = scorer.score_detailed("Python was first released in ١٩٩٩.", CONTEXT_CHUNKS)
+        assert detail["numeric"] < 1.0
+
+    @pytest.mark.parametrize("response", [
+        "It maybe2 works.", "The result is likely_x high.", "PROBABLY fine",
+        "Maybe.", "unmaybe likelyhood", "not sure", "No hedging here.",
+    ])
+    def test_hedge_penalty_matches_token_membership(self, scorer: FaithfulnessScorer, response):
+        """The presence pre-check never changes the token-based penalty."""
+        from evaluation.faithfulness import HEDGE_RE, HEDGE_WORDS
+        words    = set(HEDGE_RE.findall(response.lower()))
+        ratio    = len(words & HEDGE_WORDS) / max(len(words), 1)
+        expected = round(min(scorer.hedge_max_penalty, ratio * 0.25 * 0.9), 4)
+        assert scorer._hedge_penalty(response, 0.1) == expected
+
     def test_empty_response_returns_zero(self, scorer: FaithfulnessScorer):
         assert scorer.score("", CONTEXT_CHUNKS) == 0.0
 
@@ -133,6 +149,87 @@ class TestFaithfulnessScorer:
             assert "semantic_sim"  in claim
             assert "best_chunk_idx" in claim
 
+    def test_repeat_scoring_hits_embedding_cache(self, scorer: FaithfulnessScorer, monkeypatch):
+        """Re-scoring the same inputs is served from the embedding cache."""
+        monkeypatch.setattr(scorer, "score_cache_size", 0)   # force re-evaluation
+        first  = scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS)
+        misses = scorer._cache_misses
+        second = scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS)
+        assert second == first
+        assert scorer._cache_misses == misses
+
+    def test_repeat_scoring_hits_score_cache(self, scorer: FaithfulnessScorer, monkeypatch):
+        """An identical (response, context) pair is not re-evaluated."""
+        first = scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS)
+        monkeypatch.setattr(scorer, "_evaluate", lambda *a, **k: pytest.fail("re-evaluated"))
+        assert scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS) == first
+
+    def test_score_cache_keys_on_stored_embeddings(self, scorer: FaithfulnessScorer, monkeypatch):
+        """Scores from stored chunk embeddings are cached per embedding matrix."""
+        stored = scorer.embed(CONTEXT_CHUNKS)
+        first  = scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS, chunk_embs=stored)
+        calls  = []
+        evaluate = scorer._evaluate
+        monkeypatch.setattr(scorer, "_evaluate", lambda *a, **k: calls.append(1) or evaluate(*a, **k))
+
+        assert scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS, chunk_embs=stored.copy()) == first
+        assert calls == []
+        scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS, chunk_embs=stored[::-1].copy())
+        assert calls == [1]
+
+    def test_clear_caches_empties_token_memo(self, scorer: FaithfulnessScorer):
+        from evaluation.faithfulness import _token_hashes
+        scorer.score(GROUNDED_RESPONSE, CONTEXT_CHUNKS)
+        assert _token_hashes.cache_info().currsize > 0
+        scorer.clear_caches()
+        assert _token_hashes.cache_info().currsize == 0
+        assert not scorer._emb_cache and not scorer._score_cache
+
+    def test_empty_input_embeds_to_empty_matrix(self, scorer: FaithfulnessScorer):
+        dim = scorer.embed(["Python"]).shape[1]
+        assert scorer.embed([]).shape == (0, dim)
+        assert scorer.precompute_chunks([]).shape == (0, dim)
+
+    def test_close_stops_encode_batcher(self):
+        """close() joins the batcher thread; later encodes run inline."""
+        batched = FaithfulnessScorer(batch_window_ms=0)
+        before  = batched.embed(["What is Python?"])
+        thread  = batched._batcher._thread
+        batched.close()
+        assert not thread.is_alive()
+        batched.clear_caches()
+        assert np.allclose(batched.embed(["What is Python?"]), before)
+        batched.close()                                # idempotent
+
+    def test_score_batch_matches_individual_scores(self, scorer: FaithfulnessScorer):
+        responses = [GROUNDED_RESPONSE, FABRICATED_RESPONSE, ""]
+        chunks    = [CONTEXT_CHUNKS, CONTEXT_CHUNKS, CONTEXT_CHUNKS]
+        assert scorer.score_batch(responses, chunks) == [
+            scorer.score(r, c) for r, c in zip(responses, chunks)
+        ]
+
+    def test_punctuation_only_response_scored_normally(self, scorer: FaithfulnessScorer):
+        """A response with no words goes through the model by default."""
+        misses = scorer._cache_misses
+        scorer.score("...", CONTEXT_CHUNKS)
+        assert scorer._cache_misses > misses
+
+    def test_short_response_score_skips_model(self, scorer: FaithfulnessScorer, monkeypatch):
+        """With short_response_score set, trivial answers skip encoding."""
+        monkeypatch.setattr(scorer, "short_response_score", 0.0)
+        misses = scorer._cache_misses
+        assert scorer.score("...", CONTEXT_CHUNKS) == 0.0
+        assert scorer.score("I don't know.", CONTEXT_CHUNKS) == 0.0
+        assert scorer._cache_misses == misses
+
+    def test_non_latin_response_is_scored(self, scorer: FaithfulnessScorer):
+        """A grounded answer in a non-Latin script goes through the model."""
+        context  = ["这种编程语言由吉多·范罗苏姆创建，于一九九一年首次发布。"]
+        response = "这种编程语言由吉多·范罗苏姆创建。"
+        misses   = scorer._cache_misses
+        assert scorer.score(response, context) > 0.0
+        assert scorer._cache_misses > misses
+
 
 # ===========================================================================
 # 2.  Metrics (pure functions — no model needed)
@@ -157,6 +254,10 @@ class TestMetrics:
         r = token_recall("the cat", "the cat sat on the mat")
         assert 0.0 < r < 1.0
 
+    def test_repeated_tokens_counted_as_multiset(self):
+        # "the" appears twice in the reference but only once in the prediction
+        assert token_recall("the cat sat", "the cat sat on the mat") == 0.5
+
     def test_f1_perfect(self):
         assert token_f1("the cat sat", "the cat sat") == 1.0
 
@@ -210,7 +311,22 @@ class TestMetrics:
             assert key in agg
             assert isinstance(agg[key], float)
 
-    # use the module-scoped scorer fixture
+    def test_evaluate_batch_without_score_batch(self):
+        """Scorers exposing only score() are called once per case."""
+        class ScoreOnly:
+            def score(self, response, context_chunks):
+                return 1.0 if response in context_chunks else 0.0
+
+        cases = [
+            {"query": "q1", "gold_answer": "a", "llm_response": "a", "context_chunks": ["a"]},
+            {"query": "q2", "gold_answer": "b", "llm_response": "b", "context_chunks": ["a"]},
+        ]
+        result = evaluate_batch(cases, ScoreOnly())
+
+        assert [s["faithfulness"] for s in result["per_sample"]] == [1.0, 0.0]
+        assert result["aggregate"]["faithfulness_pass_rate"] == 0.5
+
+    # use the session-scoped scorer fixture
     @pytest.fixture(autouse=False)
     def scorer(self, scorer):
         return scorer
@@ -225,12 +341,14 @@ class TestMetrics:
 
 class MockVectorStore:
     """Returns the global CONTEXT_CHUNKS regardless of query."""
-    def query(self, query_texts: list[str], n_results: int = 5) -> dict:
+    def query(self, query_texts: list[str], n_results: int = 5, where: dict | None = None) -> dict:
+        self.last_where = where
         docs = CONTEXT_CHUNKS[:n_results]
+        n_q  = len(query_texts)
         return {
-            "documents": [docs],
-            "distances":  [[0.1] * len(docs)],
-            "metadatas":  [[{"source": f"doc_{i}"} for i in range(len(docs))]],
+            "documents": [docs] * n_q,
+            "distances":  [[0.1] * len(docs)] * n_q,
+            "metadatas":  [[{"source": f"doc_{i}"} for i in range(len(docs))]] * n_q,
         }
 
 
@@ -239,13 +357,9 @@ def _echo_llm(system: str, user: str) -> str:
     Extracts the context block from the prompt and returns it.
     This makes the response maximally grounded so the faithfulness check passes.
     """
-    start_marker = "--- RETRIEVED CONTEXT ---"
-    end_marker   = "--- END CONTEXT ---"
-    s = user.find(start_marker)
-    e = user.find(end_marker)
-    if s != -1 and e != -1:
-        return user[s + len(start_marker):e].strip()
-    return user
+    _, start, rest = user.partition("--- RETRIEVED CONTEXT ---")
+    context, end, _ = rest.partition("--- END CONTEXT ---")
+    return context.strip() if start and end else user
 
 
 def _bad_llm(system: str, user: str) -> str:
@@ -311,6 +425,35 @@ class TestRAGPipeline:
         assert "GENERATE"     in stages
         assert "FAITHFULNESS" in stages
 
+    def test_run_batch_single_store_call(self, good_pipeline: RAGPipeline):
+        calls = []
+        original = good_pipeline.vector_store.query
+
+        def counting_query(*args, **kwargs):
+            calls.append(kwargs.get("query_texts"))
+            return original(*args, **kwargs)
+
+        good_pipeline.vector_store.query = counting_query
+        try:
+            resps = good_pipeline.run_batch(["What is Python?", "Tell me about Python 3.11."])
+        finally:
+            del good_pipeline.vector_store.query
+        assert len(calls) == 1 and len(calls[0]) == 2
+        assert [r.query for r in resps] == ["What is Python?", "Tell me about Python 3.11."]
+        assert all(r.chunks_used for r in resps)
+
+    def test_arun_batch_matches_run_batch(self, good_pipeline: RAGPipeline):
+        queries = ["What is Python?", "Tell me about Python 3.11."]
+        resps   = asyncio.run(good_pipeline.arun_batch(queries))
+        assert [r.query for r in resps] == queries
+        assert [r.answer for r in resps] == [r.answer for r in good_pipeline.run_batch(queries)]
+        assert asyncio.run(good_pipeline.arun(queries[0])).answer == resps[0].answer
+
+    def test_where_filter_forwarded(self, good_pipeline: RAGPipeline):
+        where = {"clearance_level_n": {"$lte": 2}}
+        good_pipeline.run("What is Python?", where=where)
+        assert good_pipeline.vector_store.last_where == where
+
     def test_latency_tracked(self, good_pipeline: RAGPipeline):
         resp = good_pipeline.run("Any question.")
         assert resp.latency_ms > 0
@@ -333,6 +476,64 @@ class TestRAGPipeline:
         resp = pipeline.run("Anything?")
         assert resp.answer == RAGPipeline.FALLBACK
 
+    def test_repeated_retry_answer_hits_score_cache(self, scorer, monkeypatch):
+        """An LLM repeating the same answer on retry is scored only once."""
+        pipeline = RAGPipeline(
+            llm_fn                 =_bad_llm,
+            vector_store           =MockVectorStore(),
+            faithfulness_threshold =0.90,
+            max_retries            =2,
+            audit_log_path         =None,
+            faithfulness_scorer    =scorer,
+        )
+        calls    = []
+        evaluate = scorer._evaluate
+        monkeypatch.setattr(scorer, "_evaluate", lambda *a, **k: calls.append(1) or evaluate(*a, **k))
+
+        resp = pipeline.run("Who invented Python?")
+        assert sum(e["stage"] == "GENERATE" for e in resp.audit_log) == 3
+        assert len(calls) == 1
+
+    def test_audit_record_written_per_request(self, good_pipeline: RAGPipeline, tmp_path):
+        """Each record reaches the file immediately, one whole line per run."""
+        import json
+        path     = tmp_path / "audit.jsonl"
+        pipeline = RAGPipeline(
+            llm_fn              =_echo_llm,
+            vector_store        =MockVectorStore(),
+            audit_log_path      =str(path),
+            faithfulness_scorer =good_pipeline._faithfulness,
+        )
+        ids = [pipeline.run("What is Python?").request_id for _ in range(2)]
+        try:
+            records = [json.loads(line) for line in path.read_text().splitlines()]
+            assert [r["request_id"] for r in records] == ids
+        finally:
+            pipeline.close()
+        pipeline.close()                               # idempotent
+
+    def test_audit_entries_carry_iso_timestamp(self, good_pipeline: RAGPipeline):
+        from datetime import datetime
+        resp = good_pipeline.run("What is Python?")
+        for entry in resp.audit_log:
+            assert set(entry) == {"stage", "message", "timestamp"}
+            assert datetime.fromisoformat(entry["timestamp"]).tzinfo is not None
+
+    def test_is_ready_reflects_scorer_and_store(self, good_pipeline: RAGPipeline):
+        assert good_pipeline.is_ready is True
+
+        class UnloadedScorer:
+            model_loaded = False
+
+        assert RAGPipeline(
+            llm_fn=_echo_llm, vector_store=MockVectorStore(), audit_log_path=None,
+            faithfulness_scorer=UnloadedScorer(),
+        ).is_ready is False
+        assert RAGPipeline(
+            llm_fn=_echo_llm, vector_store=None, audit_log_path=None,
+            faithfulness_scorer=good_pipeline._faithfulness,
+        ).is_ready is False
+
     def test_empty_vector_store_returns_fallback(self):
         """When the vector store returns nothing, fallback is immediate."""
         class EmptyStore:
@@ -346,4 +547,29 @@ class TestRAGPipeline:
         )
         resp = pipeline.run("Will this work?")
         assert resp.answer == RAGPipeline.FALLBACK
-        assert resp.retries_used == 0
\ No newline at end of file
+        assert resp.retries_used == 0
+
+    def test_reuses_stored_chunk_embeddings(self, good_pipeline: RAGPipeline):
+        """Stored chunk vectors are passed through and give the same score."""
+        scorer = good_pipeline._faithfulness
+        stored = scorer.embed(CONTEXT_CHUNKS).tolist()
+
+        class EmbeddingStore(MockVectorStore):
+            def query(self, query_texts, n_results=5, include=None):
+                result = super().query(query_texts, n_results)
+                if include and "embeddings" in include:
+                    result["embeddings"] = [stored[:n_results]]
+                return result
+
+        pipeline = RAGPipeline(
+            llm_fn                 =_echo_llm,
+            vector_store           =EmbeddingStore(),
+            faithfulness_threshold =0.50,
+            max_retries            =1,
+            audit_log_path         =None,
+            faithfulness_scorer    =scorer,
+            reuse_store_embeddings =True,
+        )
+        resp = pipeline.run("What is Python?")
+        assert all(c.embedding is not None for c in resp.chunks_used)
+        assert resp.faithfulness_score == good_pipeline.run("What is Python?").faithfulness_score